@@ -13,18 +13,55 @@ except ImportError:
 
 import streamlit as st
 import os
-from helpers import text_to_speech, autoplay_audio, speech_to_text
-from generate_answer import conduct_interview, VectorDB
+import uuid
+import logging
+from helpers import (
+    text_to_speech,
+    autoplay_audio,
+    synthesize_speech,
+    queue_audio_clip,
+)
+from generate_answer import (
+    stream_interview,
+    start_indexing,
+    create_conversation_memory,
+)
+from turn_engine import iter_turn
+import config
 from audio_recorder_streamlit import audio_recorder
 from streamlit_float import *
-from tempfile import NamedTemporaryFile
 from evaluation import evaluate_candidate_performance, display_performance_report
 from podcast_generator import create_podcast_from_evaluation
+from utils.session_utils import save_uploaded_pdf, get_candidate_id
+from utils.tts_pipeline import SpeechPipeline
 
 # Create utils directory and session_utils.py
 os.makedirs("utils", exist_ok=True)
 
 
+def record_question_asked():
+    """Count the interviewer's new question; move on a stage after two questions."""
+    st.session_state.interview_stage["questions_asked"] += 1
+    st.session_state.total_questions_asked += 1
+
+    if st.session_state.total_questions_asked == config.MAX_QUESTIONS:
+        st.session_state.waiting_for_last_answer = True
+
+    if st.session_state.interview_stage["questions_asked"] >= 2:
+        stages = st.session_state.interview_stage["stages"]
+        current_index = stages.index(st.session_state.interview_stage["current"])
+        if current_index < len(stages) - 1:
+            st.session_state.interview_stage["current"] = stages[current_index + 1]
+            st.session_state.interview_stage["questions_asked"] = 0
+
+
+def remember_reply(reply: str):
+    """Add the interviewer's reply to the transcript and refresh the summary memory."""
+    st.session_state.messages.append({"role": "assistant", "content": reply})
+    # Older turns are folded into the summary in the background
+    st.session_state.conversation_memory.update(st.session_state.messages)
+
+
 def main():
     # Initialize float feature
     float_init()
@@ -386,6 +423,18 @@ def main():
     if "interview_complete" not in st.session_state:
         st.session_state.interview_complete = False
 
+    # Last retrieved context, so low-information turns can reuse it
+    if "retrieval_state" not in st.session_state:
+        st.session_state.retrieval_state = {}
+
+    # Bounded history for the interviewer: recent turns plus a rolling summary
+    if "conversation_memory" not in st.session_state:
+        st.session_state.conversation_memory = create_conversation_memory()
+
+    # Per-turn reply latency: time to first token and total, in seconds
+    if "turn_metrics" not in st.session_state:
+        st.session_state.turn_metrics = []
+
     # Check if evaluation is ready to be displayed
     if st.session_state.evaluation is not None:
         display_performance_report()
@@ -436,7 +485,9 @@ def main():
                 unsafe_allow_html=True,
             )
             resume_file = st.file_uploader("", type=["pdf"], key="resume_uploader")
+            resume_path = None
             if resume_file is not None:
+                resume_path = save_uploaded_pdf(resume_file)
                 st.success("Resume uploaded successfully ✓")
             st.markdown("</div>", unsafe_allow_html=True)
 
@@ -454,7 +505,9 @@ def main():
             cover_letter_file = st.file_uploader(
                 "", type=["pdf"], key="cover_letter_uploader"
             )
+            cover_letter_path = None
             if cover_letter_file is not None:
+                cover_letter_path = save_uploaded_pdf(cover_letter_file)
                 st.success("Cover letter uploaded successfully ✓")
             st.markdown("</div>", unsafe_allow_html=True)
 
@@ -492,6 +545,15 @@ def main():
         st.session_state.job_description = job_description
         st.markdown("</div>", unsafe_allow_html=True)
 
+        # Start indexing in the background right away, while the user is still
+        # pasting the job description, instead of after "Start Your Interview"
+        uploaded_paths = [path for path in [resume_path, cover_letter_path] if path]
+        start_indexing(
+            uploaded_paths,
+            candidate_id=get_candidate_id(resume_path),
+            job_description=job_description,
+        )
+
         # Check if at least one field is provided
         documents_provided = (
             resume_file is not None
@@ -548,20 +610,12 @@ def main():
                 if st.button(
                     "🚀 Start Your Interview", key="start_interview", type="primary"
                 ):
-                    # Save the documents before rerunning
-                    if resume_file is not None:
-                        with NamedTemporaryFile(
-                            delete=False, suffix=".pdf"
-                        ) as resume_temp:
-                            resume_temp.write(resume_file.getvalue())
-                            st.session_state.resume_path = resume_temp.name
-
-                    if cover_letter_file is not None:
-                        with NamedTemporaryFile(
-                            delete=False, suffix=".pdf"
-                        ) as cover_letter_temp:
-                            cover_letter_temp.write(cover_letter_file.getvalue())
-                            st.session_state.cover_letter_path = cover_letter_temp.name
+                    # Keep the already-saved documents for the interview stage
+                    if resume_path is not None:
+                        st.session_state.resume_path = resume_path
+
+                    if cover_letter_path is not None:
+                        st.session_state.cover_letter_path = cover_letter_path
 
                     st.session_state.interview_started = True
                     st.rerun()
@@ -584,9 +638,14 @@ def main():
     ):
         pdf_paths.append(st.session_state.cover_letter_path)
 
-    # Initialize VectorDB with the paths of the uploaded PDFs
+    # Get the (cached) VectorDB for the uploaded PDFs. Indexing normally
+    # started at upload time; this only returns the readiness handle
     try:
-        vector_db = VectorDB(pdf_paths) if pdf_paths else None
+        vector_db = start_indexing(
+            pdf_paths,
+            candidate_id=get_candidate_id(st.session_state.get("resume_path")),
+            job_description=st.session_state.job_description,
+        )
         if vector_db and not vector_db.is_available:
             st.warning(
                 "Document search capability is disabled due to environment limitations. The interview will proceed without referencing your documents."
@@ -680,70 +739,126 @@ def main():
         with st.chat_message(message["role"]):
             st.write(message["content"])
 
-    # Process audio input if available
+    # Process audio input if available: the turn engine transcribes the
+    # answer and, while questions remain, streams and speaks the next one
+    # (retrieval starts as soon as the transcript is in)
     if audio_bytes:
-        with st.spinner("Transcribing..."):
-            webm_file_path = "temp_audio.mp3"
-            with open(webm_file_path, "wb") as f:
-                f.write(audio_bytes)
-            transcript = speech_to_text(webm_file_path)
+        wants_reply = st.session_state.total_questions_asked < config.MAX_QUESTIONS
+        turn = iter_turn(
+            messages=st.session_state.messages,
+            vector_db=vector_db,
+            audio=audio_bytes,
+            audio_name="temp_audio.mp3",
+            interview_stage=st.session_state.interview_stage,
+            retrieval_state=st.session_state.retrieval_state,
+            memory=st.session_state.conversation_memory,
+            reply=wants_reply,
+        )
+        transcript = None
+        try:
+            with st.spinner("Transcribing..."):
+                transcript = next(turn)["text"]
             if transcript:
                 st.session_state.messages.append(
                     {"role": "user", "content": transcript}
                 )
                 with st.chat_message("user"):
                     st.write(transcript)
-            os.remove(webm_file_path)
+            if transcript and wants_reply:
+                with st.chat_message("assistant"):
+                    audio_slot = st.container()
+                    turn_id = uuid.uuid4().hex
+                    turn_metrics = {}
+
+                    def engine_reply():
+                        for event in turn:
+                            if event["type"] == "token":
+                                yield event["text"]
+                            elif event["type"] == "clip":
+                                with audio_slot:
+                                    queue_audio_clip(
+                                        turn_id, event["index"], event["audio"]
+                                    )
+                            elif event["type"] == "done":
+                                timings = event["timings"]
+                                turn_metrics["stages"] = timings
+                                if "first_token" in timings["marks"]:
+                                    turn_metrics["ttft_seconds"] = (
+                                        timings["marks"]["first_token"] / 1000
+                                    )
+                                turn_metrics["total_seconds"] = (
+                                    timings["total_ms"] / 1000
+                                )
+                                turn_metrics.update(event["usage"])
+
+                    final_response = st.write_stream(engine_reply())
+                st.session_state.turn_metrics.append(turn_metrics)
+                record_question_asked()
+                remember_reply(final_response)
+            else:
+                for _ in turn:
+                    pass
+        except Exception as e:
+            logging.error(f"Turn engine failed: {str(e)}")
+            if transcript is None:
+                # Nothing below can recover the answer; ask for it again
+                st.error(
+                    "Sorry, we couldn't transcribe your answer. Please record it again."
+                )
+            else:
+                # The reply is generated step by step below instead
+                print(f"Turn engine failed, falling back to the step-by-step turn: {e}")
 
     # If the last message is not from the assistant, generate a response
     if (
         st.session_state.messages[-1]["role"] != "assistant"
-        and st.session_state.total_questions_asked < 3
+        and st.session_state.total_questions_asked < config.MAX_QUESTIONS
     ):
         with st.chat_message("assistant"):
-            with st.spinner("Thinking🤔..."):
-                if vector_db:
-                    final_response = conduct_interview(
+            turn_metrics = {}
+            if vector_db:
+                with st.spinner("Thinking🤔..."):
+                    # Wait for the first indexed chunks, but don't hold the
+                    # turn hostage to a slow ingestion
+                    vector_db.wait_until_queryable(config.INDEX_READY_TIMEOUT_SECONDS)
+            # Render the reply token by token as it is generated, and speak
+            # each sentence as soon as it is complete and synthesized
+            speech = SpeechPipeline(synthesize_speech, config.TTS_WORKERS)
+            audio_slot = st.container()
+            turn_id = uuid.uuid4().hex
+
+            def speak_while_streaming(reply):
+                for piece in reply:
+                    speech.feed(piece)
+                    with audio_slot:
+                        for clip in speech.ready_clips():
+                            queue_audio_clip(turn_id, clip["index"], clip["audio"])
+                    yield piece
+                speech.close()
+                with audio_slot:
+                    for clip in speech.remaining_clips():
+                        queue_audio_clip(turn_id, clip["index"], clip["audio"])
+
+            final_response = st.write_stream(
+                speak_while_streaming(
+                    stream_interview(
                         st.session_state.messages,
                         vector_db,
                         st.session_state.interview_stage,
+                        st.session_state.retrieval_state,
+                        metrics=turn_metrics,
+                        memory=st.session_state.conversation_memory,
                     )
-                else:
-                    final_response = conduct_interview(
-                        st.session_state.messages,
-                        None,
-                        st.session_state.interview_stage,
-                    )
-
-                st.session_state.interview_stage["questions_asked"] += 1
-                st.session_state.total_questions_asked += 1
-
-                if st.session_state.total_questions_asked == 3:
-                    st.session_state.waiting_for_last_answer = True
-
-                if st.session_state.interview_stage["questions_asked"] >= 2:
-                    stages = st.session_state.interview_stage["stages"]
-                    current_index = stages.index(
-                        st.session_state.interview_stage["current"]
-                    )
-                    if current_index < len(stages) - 1:
-                        st.session_state.interview_stage["current"] = stages[
-                            current_index + 1
-                        ]
-                        st.session_state.interview_stage["questions_asked"] = 0
-
-            with st.spinner("Generating audio response..."):
-                audio_file = text_to_speech(final_response)
-                autoplay_audio(audio_file)
-            st.write(final_response)
-            st.session_state.messages.append(
-                {"role": "assistant", "content": final_response}
+                )
             )
-            os.remove(audio_file)
+            turn_metrics.update(speech.stats())
+            st.session_state.turn_metrics.append(turn_metrics)
+            record_question_asked()
+            remember_reply(final_response)
 
-    # Check if all 3 questions have been asked and answered but the thankyou message hasn't been sent
+    # Check if all questions have been asked and answered but the thankyou message hasn't been sent
     if (
-        st.session_state.total_questions_asked >= 3
+        st.session_state.total_questions_asked >= config.MAX_QUESTIONS
         and st.session_state.waiting_for_last_answer
         and st.session_state.messages[-1]["role"] == "user"
         and not st.session_state.interview_complete
@@ -0,0 +1,94 @@
+"""Compare full-transcript history with ConversationMemory over a long interview.
+
+Usage:
+    python -m benchmarks.bench_conversation_memory
+    python -m benchmarks.bench_conversation_memory --turns 40 --recent-turns 3 --budget 1200
+
+Simulates an interview of ``--turns`` question/answer pairs with answers of
+realistic length and reports the history tokens sent per turn (the part of
+the prompt that grows with the interview) and the total over the interview.
+The summarizer is a local stand-in (first sentence of each answer), so this
+runs offline; it measures prompt size, not summary quality.
+"""
+
+import argparse
+import random
+
+from utils.conversation_memory import ConversationMemory, message_tokens
+from utils.token_counter import truncate_to_tokens
+
+TOPICS = [
+    "the Kubernetes migration",
+    "the data ingestion platform",
+    "a conflict with a product manager",
+    "mentoring two junior engineers",
+    "the PostgreSQL outage",
+    "the real-time analytics dashboard",
+    "moving the ML training pipeline to PyTorch",
+]
+
+
+def make_answer(rng: random.Random, topic: str) -> str:
+    sentences = [f"At Initech I owned {topic} end to end."]
+    for _ in range(rng.randint(5, 9)):
+        sentences.append(
+            rng.choice(
+                [
+                    "We started by measuring where the time actually went.",
+                    "I wrote the design doc and walked the team through the trade-offs.",
+                    "The hardest part was keeping the old system running during the cutover.",
+                    "We rolled it out behind a feature flag, one region at a time.",
+                    "Latency dropped by about forty percent and on-call pages halved.",
+                    "In hindsight I would have involved the SRE team earlier.",
+                ]
+            )
+        )
+    return " ".join(sentences)
+
+
+def fake_summarize(previous: str, messages, max_tokens: int) -> str:
+    notes = [previous] if previous else []
+    notes += [m["content"].split(".")[0] + "." for m in messages if m["role"] == "user"]
+    return truncate_to_tokens(" ".join(notes), max_tokens)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--recent-turns", type=int, default=4)
+    parser.add_argument("--budget", type=int, default=1500)
+    parser.add_argument("--summary-budget", type=int, default=300)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    memory = ConversationMemory(
+        fake_summarize, args.recent_turns, args.budget, args.summary_budget
+    )
+    history = [{"role": "assistant", "content": "Tell me about your background."}]
+    full_total = memory_total = 0
+    print(f"{'turn':>5} {'full history':>13} {'with memory':>12}")
+    for turn in range(1, args.turns + 1):
+        topic = TOPICS[turn % len(TOPICS)]
+        history.append({"role": "user", "content": make_answer(rng, topic)})
+        full = message_tokens(history)
+        bounded = message_tokens(memory.context_messages(history))
+        full_total += full
+        memory_total += bounded
+        if turn == 1 or turn % 5 == 0:
+            print(f"{turn:>5} {full:>13} {bounded:>12}")
+        history.append(
+            {
+                "role": "assistant",
+                "content": f"Thanks. What did you learn from {topic}?",
+            }
+        )
+        memory.update(history)
+        memory.wait()
+    print(
+        f"total {full_total:>13} {memory_total:>12} "
+        f"({1 - memory_total / full_total:.0%} fewer history tokens)"
+    )
+
+
+if __name__ == "__main__":
+    main()
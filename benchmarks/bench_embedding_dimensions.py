@@ -0,0 +1,140 @@
+"""Compare embedding dimensionalities: index size, build time and recall@3.
+
+Usage:
+    python -m benchmarks.bench_embedding_dimensions
+    python -m benchmarks.bench_embedding_dimensions --dims 256 512 1536 --resumes 5
+    python -m benchmarks.bench_embedding_dimensions --embeddings hashing  # offline
+
+Sample resumes from ``benchmarks.sample_pdfs`` are chunked with the section
+splitter, embedded at each dimensionality and written to a fresh persistent
+Chroma collection (build time and on-disk size). Recall@3 compares each
+setting's exact top-3 against the top-3 at the largest dimensionality, for
+a set of interview-style queries and bullet lines taken from the resumes.
+With the default OpenAI embeddings this calls the API (OPENAI_API_KEY must
+be set) once per setting.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.sample_pdfs import write_sample_pdf
+from utils.embedding_backends import create_embeddings
+from utils.ingestion import iter_pdf_pages
+from utils.resume_splitter import ResumeSectionSplitter
+from utils.vector_backends import ChromaBackend, NumpyBackend
+
+QUERIES = [
+    "Tell me about your Kubernetes experience",
+    "I built an ML training pipeline with PyTorch",
+    "How did you scale the data ingestion platform?",
+    "What did you do at Globex?",
+    "Describe a time you led a migration",
+    "Which cloud platforms have you used?",
+    "What is your educational background?",
+    "Tell me about the real-time analytics dashboard",
+]
+
+
+def dir_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def load_chunks(tmp_dir: str, resumes: int, pages: int):
+    chunks = []
+    for seed in range(resumes):
+        pdf_path = write_sample_pdf(
+            os.path.join(tmp_dir, f"resume-{seed}.pdf"), pages, seed=seed
+        )
+        splitter = ResumeSectionSplitter()
+        for page in iter_pdf_pages([pdf_path]):
+            chunks.extend(splitter.split_documents([page]))
+    return chunks
+
+
+def make_queries(chunks, count: int, rng: random.Random):
+    """Fixed questions plus single bullet lines, as a candidate might paraphrase them."""
+    bullets = [
+        line.lstrip("- ")
+        for chunk in chunks
+        for line in chunk.page_content.splitlines()
+        if line.startswith("- ")
+    ]
+    return QUERIES + rng.sample(bullets, min(count, len(bullets)))
+
+
+def top_ids(backend, query_vectors, k: int):
+    return [
+        [doc.metadata["chunk_id"] for doc in backend.search(vector, k)]
+        for vector in query_vectors
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dims", type=int, nargs="+", default=[256, 512, 1024, 1536])
+    parser.add_argument("--model", default="text-embedding-3-small")
+    parser.add_argument("--embeddings", choices=["openai", "hashing"], default="openai")
+    parser.add_argument("--resumes", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--queries", type=int, default=40)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    import chromadb
+
+    rng = random.Random(0)
+    dims_list = sorted(args.dims, reverse=True)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chunks = load_chunks(tmp_dir, args.resumes, args.pages)
+        texts = [chunk.page_content for chunk in chunks]
+        ids = [f"chunk-{i}" for i in range(len(chunks))]
+        metadatas = [{"chunk_id": chunk_id} for chunk_id in ids]
+        queries = make_queries(chunks, args.queries, rng)
+        model = args.model if args.embeddings == "openai" else args.embeddings
+        print(f"{len(chunks)} chunks, {len(queries)} queries, embeddings {model}")
+        print(
+            f"{'dims':>6} {'vectors (KB)':>13} {'on disk (KB)':>13} "
+            f"{'build (s)':>10} {'recall@' + str(args.k):>9}"
+        )
+
+        reference = None
+        for dims in dims_list:
+            embeddings = create_embeddings(
+                args.embeddings, model_name=args.model, dimensions=dims
+            )
+            persist_dir = os.path.join(tmp_dir, f"chroma-{dims}")
+            start = time.perf_counter()
+            vectors = embeddings.embed_documents(texts)
+            chroma = ChromaBackend(
+                f"dims-{dims}", chromadb.PersistentClient(path=persist_dir)
+            )
+            chroma.upsert(ids, vectors, texts, metadatas)
+            build = time.perf_counter() - start
+
+            exact = NumpyBackend(f"dims-{dims}")
+            exact.upsert(ids, vectors, texts, metadatas)
+            results = top_ids(
+                exact, [embeddings.embed_query(query) for query in queries], args.k
+            )
+            if reference is None:
+                reference = results
+            recall = sum(
+                len(set(got) & set(want)) / len(want)
+                for got, want in zip(results, reference)
+            ) / len(queries)
+
+            print(
+                f"{dims:>6} {len(vectors) * dims * 4 / 1024:>13.1f} "
+                f"{dir_size(persist_dir) / 1024:>13.1f} {build:>10.3f} {recall:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark the streaming ingestion pipeline on 1-, 10- and 100-page PDFs.
+
+Usage:
+    python -m benchmarks.bench_embedding_pipeline
+    python -m benchmarks.bench_embedding_pipeline --simulated-latency-ms 300
+
+By default this calls the OpenAI embeddings API (OPENAI_API_KEY must be set).
+``--simulated-latency-ms`` swaps in an embedder that sleeps per request (plus
+5ms per chunk), which isolates the batching/concurrency behaviour without
+spending API credits.
+
+Compares one embedding call for the whole document with the path ingestion
+uses: pages split as they are read, batched and embedded by
+``stream_embeddings`` with bounded concurrency.
+"""
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.embeddings import Embeddings
+
+import config
+from benchmarks.sample_pdfs import write_sample_pdf
+from utils.ingestion import iter_chunk_batches, iter_pdf_pages, stream_embeddings
+
+
+class SimulatedLatencyEmbeddings(Embeddings):
+    """Returns deterministic vectors after a per-request plus per-text delay."""
+
+    def __init__(
+        self,
+        latency_seconds: float,
+        per_text_seconds: float = 0.005,
+        dimensions: int = 1536,
+    ):
+        self.latency_seconds = latency_seconds
+        self.per_text_seconds = per_text_seconds
+        self.dimensions = dimensions
+
+    def embed_documents(self, texts):
+        time.sleep(self.latency_seconds + self.per_text_seconds * len(texts))
+        vectors = []
+        for text in texts:
+            seed = hashlib.sha256(text.encode("utf-8")).digest()
+            vectors.append(
+                [seed[i % len(seed)] / 255.0 for i in range(self.dimensions)]
+            )
+        return vectors
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def make_splitter():
+    return RecursiveCharacterTextSplitter(
+        chunk_size=config.CHUNK_SIZE, chunk_overlap=config.CHUNK_OVERLAP
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--batch-size", type=int, default=config.EMBED_BATCH_SIZE)
+    parser.add_argument(
+        "--max-concurrency", type=int, default=config.EMBED_MAX_CONCURRENCY
+    )
+    parser.add_argument("--simulated-latency-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    if args.simulated_latency_ms is not None:
+        embeddings = SimulatedLatencyEmbeddings(args.simulated_latency_ms / 1000)
+    else:
+        from langchain.embeddings import OpenAIEmbeddings
+
+        embeddings = OpenAIEmbeddings(max_retries=0)
+
+    print(
+        f"{'pages':>6} {'chunks':>7} {'single call (s)':>16} {'chunks/s':>9} "
+        f"{'pipeline (s)':>13} {'chunks/s':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for pages in args.pages:
+            pdf_path = write_sample_pdf(os.path.join(tmp_dir, f"{pages}.pdf"), pages)
+            start = time.perf_counter()
+            chunks = make_splitter().split_documents(list(iter_pdf_pages([pdf_path])))
+            texts = [chunk.page_content for chunk in chunks]
+            embeddings.embed_documents(texts)
+            single = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in stream_embeddings(
+                iter_chunk_batches(
+                    iter_pdf_pages([pdf_path]), make_splitter(), args.batch_size
+                ),
+                embeddings,
+                max_concurrency=args.max_concurrency,
+            ):
+                pass
+            pipelined = time.perf_counter() - start
+
+            print(
+                f"{pages:>6} {len(texts):>7} {single:>16.3f} {len(texts) / single:>9.1f} "
+                f"{pipelined:>13.3f} {len(texts) / pipelined:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Ingest and query sample resumes end to end without any network calls.
+
+Usage:
+    python -m benchmarks.bench_local_retrieval
+    python -m benchmarks.bench_local_retrieval --pages 1 10 100 --backend numpy
+
+Runs the real VectorDB pipeline (PDF extraction, chunking, embedding,
+vector + BM25 indexing, hybrid search) with the local hashing embeddings,
+so it works offline and in CI. Uses a throwaway cache/Chroma directory.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import config
+from benchmarks.sample_pdfs import write_sample_pdf
+
+QUERIES = [
+    "Tell me about your Kubernetes experience",
+    "I built an ML training pipeline with PyTorch",
+    "How did you scale the data ingestion platform?",
+    "What did you do at Globex?",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--backend", choices=["chroma", "numpy"], default="numpy")
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config.EMBEDDING_BACKEND = "hashing"
+        config.VECTOR_BACKEND = args.backend
+        config.EMBEDDING_CACHE_PATH = os.path.join(tmp_dir, "embeddings.sqlite3")
+        config.CHROMA_PERSIST_DIR = os.path.join(tmp_dir, "chroma")
+        config.NUMPY_PERSIST_DIR = os.path.join(tmp_dir, "numpy")
+        import generate_answer
+
+        print(
+            f"{'pages':>6} {'chunks':>7} {'queryable (s)':>14} {'complete (s)':>13} "
+            f"{'query p50 (ms)':>15} {'query p95 (ms)':>15}"
+        )
+        for pages in args.pages:
+            pdf_path = write_sample_pdf(
+                os.path.join(tmp_dir, f"{pages}.pdf"), pages, seed=pages
+            )
+            start = time.perf_counter()
+            vector_db = generate_answer.VectorDB([pdf_path])
+            vector_db.wait_until_queryable()
+            queryable = time.perf_counter() - start
+            vector_db.wait_until_complete()
+            complete = time.perf_counter() - start
+
+            latencies = []
+            for i in range(args.queries):
+                # Vary the text so the result cache doesn't answer every query
+                query = f"{QUERIES[i % len(QUERIES)]} ({i})"
+                start = time.perf_counter()
+                vector_db.search(query, config.RETRIEVAL_K_DOCUMENTS)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            print(
+                f"{pages:>6} {vector_db.chunk_count:>7} {queryable:>14.3f} "
+                f"{complete:>13.3f} {p50 * 1000:>15.2f} {p95 * 1000:>15.2f}"
+            )
+            vector_db.delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark serial vs process-pool PDF text extraction on multi-page documents.
+
+Usage:
+    python -m benchmarks.bench_pdf_extraction
+    python -m benchmarks.bench_pdf_extraction --pages 20 100 --workers 2 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import config
+from benchmarks.sample_pdfs import write_sample_pdf
+from utils.ingestion import iter_pdf_pages
+from utils.pdf_extraction import iter_pdf_pages_parallel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[config.PDF_EXTRACTION_WORKERS]
+    )
+    parser.add_argument("--pages-per-task", type=int, default=config.PDF_PAGES_PER_TASK)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'mode':>12} {'seconds':>9} {'pages/s':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for pages in args.pages:
+            # A resume-sized and a portfolio-sized document, like a real upload
+            pdf_paths = [
+                write_sample_pdf(os.path.join(tmp_dir, f"resume_{pages}.pdf"), 2),
+                write_sample_pdf(
+                    os.path.join(tmp_dir, f"portfolio_{pages}.pdf"), pages, seed=1
+                ),
+            ]
+            total_pages = pages + 2
+
+            start = time.perf_counter()
+            serial_count = sum(1 for _ in iter_pdf_pages(pdf_paths))
+            elapsed = time.perf_counter() - start
+            print(
+                f"{total_pages:>6} {'serial':>12} {elapsed:>9.3f} "
+                f"{serial_count / elapsed:>9.1f}"
+            )
+
+            for workers in args.workers:
+                pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                # Warm the workers: the app's pool lives for the whole process,
+                # so start-up shouldn't be counted per document
+                list(iter_pdf_pages_parallel(pdf_paths, workers, 1, executor=pool))
+
+                start = time.perf_counter()
+                pooled_count = sum(
+                    1
+                    for _ in iter_pdf_pages_parallel(
+                        pdf_paths,
+                        max_workers=workers,
+                        pages_per_task=args.pages_per_task,
+                        executor=pool,
+                    )
+                )
+                elapsed = time.perf_counter() - start
+                pool.shutdown()
+                assert pooled_count == serial_count
+                print(
+                    f"{total_pages:>6} {f'pool x{workers}':>12} {elapsed:>9.3f} "
+                    f"{pooled_count / elapsed:>9.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
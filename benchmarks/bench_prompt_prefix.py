@@ -0,0 +1,156 @@
+"""Measure how much of each turn's prompt repeats the previous turn's prefix.
+
+Usage:
+    python -m benchmarks.bench_prompt_prefix
+    python -m benchmarks.bench_prompt_prefix --turns 12 --reference-tokens 3000
+
+OpenAI's prompt cache only reuses an identical leading prefix, so the
+number to watch is the tokens each prompt shares with the one before it.
+Compares the previous layout (interview stage and question count in the
+system prompt, the whole transcript, then the retrieved context and the
+latest message again in a final user message) with ``assemble_messages``
+(static system prompt and reference, ``ConversationMemory`` history, then
+turn notes). The memory's summary rolls as the interview goes on, which
+breaks the shared prefix on those turns; they are marked with "*".
+Runs offline on synthetic text, with a stand-in summarizer.
+"""
+
+import argparse
+import random
+
+import config
+from generate_answer import _interview_inputs, reference_block
+from utils.conversation_memory import ConversationMemory
+from utils.prompt_assembly import assemble_messages
+from utils.token_counter import count_tokens
+
+WORDS = (
+    "kubernetes migration latency pipeline postgres dashboard mentoring "
+    "design review rollout feature flag incident on-call terraform python"
+).split()
+STAGES = ["introduction", "technical", "behavioral", "experience", "closing"]
+
+
+def text(rng: random.Random, tokens: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(tokens))
+
+
+def serialize(messages) -> str:
+    return "".join(f"<{m['role']}>{m['content']}" for m in messages)
+
+
+def shared_prefix_tokens(previous: str, current: str) -> int:
+    length = 0
+    for a, b in zip(previous, current):
+        if a != b:
+            break
+        length += 1
+    return count_tokens(current[:length])
+
+
+def legacy_layout(messages, interview_stage, turn_context):
+    """The prompt as it was built before ``assemble_messages``."""
+    instructions, _, query, stage_note = _interview_inputs(messages, interview_stage)
+    formatted_prompt = f"""
+Context information from the candidate's documents:
+{turn_context}
+
+Leverage the context and details provided to structure your questions and responses.
+Focus on extracting the candidate's skills, experiences, and achievements that best demonstrate their capabilities.
+Conduct this session as a professional, respectful job interview—maintaining an unbiased tone while adapting your
+questions based on the candidate's background and responses Remain in character as a seasoned interviewer throughout the session.
+"""
+    return (
+        [{"role": "system", "content": f"{instructions}\n\n{stage_note}"}]
+        + [m for m in messages if m["role"] in ("user", "assistant")]
+        + [
+            {
+                "role": "user",
+                "content": formatted_prompt + "\n\nUser message: " + query,
+            }
+        ]
+    )
+
+
+def assembled_layout(messages, interview_stage, memory, reference, turn_context):
+    """The prompt as ``ConversationalRetrievalChain.build_messages`` lays it out."""
+    instructions, history, query, turn_notes = _interview_inputs(
+        messages, interview_stage, memory
+    )
+    turn_notes += (
+        "\n\nMore context relevant to the candidate's latest message:\n" + turn_context
+    )
+    return assemble_messages(instructions, reference, history, query, turn_notes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument(
+        "--reference-tokens", type=int, default=config.CONTEXT_TOKEN_BUDGET
+    )
+    parser.add_argument(
+        "--turn-context-tokens", type=int, default=config.TURN_CONTEXT_TOKEN_BUDGET
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+
+    def summarize(previous_summary, messages, max_tokens):
+        # Stand-in for the summary model: new notes every time it runs
+        return text(rng, int(max_tokens * 0.75))
+
+    memory = ConversationMemory(
+        summarize,
+        recent_turns=config.MEMORY_RECENT_TURNS,
+        token_budget=config.HISTORY_TOKEN_BUDGET,
+        summary_token_budget=config.SUMMARY_TOKEN_BUDGET,
+    )
+    reference = reference_block(text(rng, args.reference_tokens))
+    messages = [{"role": "assistant", "content": "Tell me about your background."}]
+    interview_stage = {"current": STAGES[0], "questions_asked": 1}
+    previous = {"legacy": "", "assembled": ""}
+    totals = {"legacy": [0, 0], "assembled": [0, 0]}
+    last_summary = ""
+    print(f"{'turn':>5} {'legacy shared/total':>22} {'assembled shared/total':>24}")
+    for turn in range(1, args.turns + 1):
+        messages.append({"role": "user", "content": text(rng, 120)})
+        turn_context = text(rng, args.turn_context_tokens)
+        prompts = {
+            "legacy": legacy_layout(messages, interview_stage, turn_context),
+            "assembled": assembled_layout(
+                messages, interview_stage, memory, reference, turn_context
+            ),
+        }
+        row = []
+        for name, prompt in prompts.items():
+            current = serialize(prompt)
+            shared = shared_prefix_tokens(previous[name], current)
+            total = count_tokens(current)
+            previous[name] = current
+            if turn > 1:
+                totals[name][0] += shared
+                totals[name][1] += total
+            row.append(f"{shared:>6}/{total:<6}")
+        rolled = "*" if memory.summary != last_summary else ""
+        last_summary = memory.summary
+        print(f"{turn:>5} {row[0]:>22} {row[1]:>24} {rolled}")
+
+        # The interviewer replies with the next question (as in app.py)
+        messages.append({"role": "assistant", "content": "Thanks. " + text(rng, 30)})
+        memory.update(messages)
+        memory.wait()
+        interview_stage["questions_asked"] += 1
+        if interview_stage["questions_asked"] >= 2:
+            index = STAGES.index(interview_stage["current"])
+            if index < len(STAGES) - 1:
+                interview_stage["current"] = STAGES[index + 1]
+                interview_stage["questions_asked"] = 0
+    for name, (shared, total) in totals.items():
+        print(
+            f"{name:>10}: {shared / total:.0%} of prompt tokens cacheable after turn 1"
+        )
+
+
+if __name__ == "__main__":
+    main()
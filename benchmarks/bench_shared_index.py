@@ -0,0 +1,119 @@
+"""Compare a shared memory-mapped index with per-process NumPy copies across workers.
+
+Usage:
+    python -m benchmarks.bench_shared_index
+    python -m benchmarks.bench_shared_index --chunks 100000 --workers 1 2 4 8
+
+Writes one corpus of random chunks both as a persisted NumpyBackend
+collection (float32, loaded into each process's heap) and as a shared index
+(``utils.shared_index``, memory-mapped read-only). For each worker count,
+that many processes open the index at the same time, run a few queries and
+report, while all are still alive, how long opening took and their memory
+from /proc/self/smaps_rollup: private (this process only) and PSS (shared
+pages split between the processes mapping them). Linux only.
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+
+import numpy as np
+
+from utils.shared_index import MappedBackend, write_mapped_index
+from utils.vector_backends import NumpyBackend
+
+
+def memory_kb() -> dict:
+    usage = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                usage[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "private": usage.get("Private_Clean", 0) + usage.get("Private_Dirty", 0),
+        "pss": usage.get("Pss", 0),
+    }
+
+
+def open_index(kind: str, tmp_dir: str):
+    if kind == "mapped":
+        return MappedBackend(f"{tmp_dir}/shared")
+    return NumpyBackend("bench", tmp_dir)
+
+
+def worker(kind, tmp_dir, queries, ready, results):
+    baseline = memory_kb()
+    start = time.perf_counter()
+    backend = open_index(kind, tmp_dir)
+    opened = time.perf_counter() - start
+    for query in queries:
+        backend.search(query, 3)
+    ready.wait()  # measure while every worker holds the index
+    usage = memory_kb()
+    results.put(
+        {
+            "open": opened,
+            "private": usage["private"] - baseline["private"],
+            "pss": usage["pss"] - baseline["pss"],
+        }
+    )
+    ready.wait()
+
+
+def run(kind: str, tmp_dir: str, workers: int, queries):
+    context = multiprocessing.get_context("spawn")
+    ready = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(kind, tmp_dir, queries, ready, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    stats = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=50000)
+    parser.add_argument("--dims", type=int, default=1536)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--queries", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.chunks, args.dims)).astype(np.float32)
+    queries = [rng.standard_normal(args.dims).tolist() for _ in range(args.queries)]
+    ids = [f"chunk-{i}" for i in range(args.chunks)]
+    texts = [f"Handbook paragraph {i}" for i in range(args.chunks)]
+    metadatas = [{"namespace": "documents", "chunk_id": i} for i in ids]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        NumpyBackend("bench", tmp_dir).upsert(ids, vectors, texts, metadatas)
+        write_mapped_index(f"{tmp_dir}/shared", ids, vectors, texts, metadatas)
+        print(
+            f"{args.chunks} chunks x {args.dims} dims "
+            f"({vectors.nbytes / 2**20:.0f} MB of float32 vectors)"
+        )
+        print(
+            f"{'index':>7} {'workers':>8} {'open (ms)':>10} "
+            f"{'private/worker (MB)':>20} {'total PSS (MB)':>15}"
+        )
+        for kind in ("numpy", "mapped"):
+            for workers in args.workers:
+                stats = run(kind, tmp_dir, workers, queries)
+                print(
+                    f"{kind:>7} {workers:>8} "
+                    f"{np.mean([s['open'] for s in stats]) * 1000:>10.1f} "
+                    f"{np.mean([s['private'] for s in stats]) / 1024:>20.1f} "
+                    f"{sum(s['pss'] for s in stats) / 1024:>15.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
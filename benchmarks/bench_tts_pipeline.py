@@ -0,0 +1,94 @@
+"""Compare whole-reply TTS with sentence-pipelined TTS: time to first audio.
+
+Usage:
+    python -m benchmarks.bench_tts_pipeline
+    python -m benchmarks.bench_tts_pipeline --tokens-per-second 30 --tts-chars-per-second 400
+
+The reply is streamed word by word at a simulated LLM rate and the TTS call
+is simulated as a fixed latency plus a per-character cost. "sequential" is
+the old flow (whole completion, then one synthesis call); "pipelined" feeds
+the stream through ``SpeechPipeline``. Reported times are from the start of
+generation: first audio is when the first clip could start playing, and
+all audio is when the last clip is ready.
+"""
+
+import argparse
+import time
+
+from utils.tts_pipeline import SpeechPipeline
+
+REPLY = (
+    "Thanks for walking me through the ingestion platform. It sounds like the "
+    "move to Kubernetes cut your deployment time considerably. I'd like to dig "
+    "into the trade-offs you made there. How did you decide which services to "
+    "migrate first, and what did you do about stateful workloads such as the "
+    "PostgreSQL clusters? Looking back, what would you do differently if you "
+    "had to run the same migration again today?"
+)
+
+
+def make_synthesize(latency: float, chars_per_second: float):
+    def synthesize(text: str) -> bytes:
+        time.sleep(latency + len(text) / chars_per_second)
+        return text.encode("utf-8")
+
+    return synthesize
+
+
+def stream_reply(tokens_per_second: float):
+    for word in REPLY.split(" "):
+        time.sleep(1 / tokens_per_second)
+        yield word + " "
+
+
+def run_sequential(args):
+    synthesize = make_synthesize(args.tts_latency, args.tts_chars_per_second)
+    start = time.perf_counter()
+    reply = "".join(stream_reply(args.tokens_per_second))
+    synthesize(reply)
+    done = time.perf_counter() - start
+    return done, done, 1
+
+
+def run_pipelined(args):
+    synthesize = make_synthesize(args.tts_latency, args.tts_chars_per_second)
+    start = time.perf_counter()
+    pipeline = SpeechPipeline(synthesize, args.workers)
+    first_audio = None
+    clips = 0
+
+    def take(found):
+        nonlocal first_audio, clips
+        for _ in found:
+            clips += 1
+            if first_audio is None:
+                first_audio = time.perf_counter() - start
+
+    for piece in stream_reply(args.tokens_per_second):
+        pipeline.feed(piece)
+        take(pipeline.ready_clips())
+    pipeline.close()
+    take(pipeline.remaining_clips())
+    return first_audio, time.perf_counter() - start, clips
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens-per-second", type=float, default=40)
+    parser.add_argument("--tts-latency", type=float, default=0.4)
+    parser.add_argument("--tts-chars-per-second", type=float, default=600)
+    parser.add_argument("--workers", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{len(REPLY.split())} words at {args.tokens_per_second:g} tokens/s; TTS "
+        f"{args.tts_latency:g}s + {args.tts_chars_per_second:g} chars/s"
+    )
+    print(f"{'mode':>11} {'first audio (s)':>16} {'all audio (s)':>14} {'clips':>6}")
+    for name, run in (("sequential", run_sequential), ("pipelined", run_pipelined)):
+        first_audio, done, clips = run(args)
+        print(f"{name:>11} {first_audio:>16.2f} {done:>14.2f} {clips:>6}")
+
+
+if __name__ == "__main__":
+    main()
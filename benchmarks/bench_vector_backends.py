@@ -0,0 +1,98 @@
+"""Compare the Chroma and NumPy vector backends: build time, memory and query latency.
+
+Usage:
+    python -m benchmarks.bench_vector_backends
+    python -m benchmarks.bench_vector_backends --chunks 10 30 300 --dims 1536
+
+Uses random unit vectors, so no API calls are made. Memory is the growth in
+process RSS while building the index, which also counts Chroma's native
+allocations.
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from utils.vector_backends import ChromaBackend, NumpyBackend
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def make_backend(name: str, chroma_client):
+    collection_name = f"bench-{uuid.uuid4().hex[:16]}"
+    if name == "numpy":
+        return NumpyBackend(collection_name)
+    return ChromaBackend(collection_name, chroma_client)
+
+
+def bench(name, vectors, queries, k, chroma_client):
+    ids = [f"chunk-{i}" for i in range(len(vectors))]
+    texts = [f"chunk text {i}" for i in range(len(vectors))]
+    metadatas = [
+        {"namespace": "documents" if i % 4 else "job_description"}
+        for i in range(len(vectors))
+    ]
+
+    gc.collect()
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    backend = make_backend(name, chroma_client)
+    backend.upsert(ids, vectors.tolist(), texts, metadatas)
+    build = time.perf_counter() - start
+    memory = rss_bytes() - rss_before
+
+    start = time.perf_counter()
+    for query in queries:
+        backend.search(query.tolist(), k, {"namespace": "documents"})
+    query_latency = (time.perf_counter() - start) / len(queries)
+
+    backend.delete_collection()
+    return build, memory, query_latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, nargs="+", default=[5, 30, 300, 3000])
+    parser.add_argument("--dims", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    import chromadb
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chroma_client = chromadb.PersistentClient(path=tmp_dir)
+        print(
+            f"{'chunks':>7} {'backend':>8} {'build (ms)':>11} "
+            f"{'memory (KB)':>12} {'query (ms)':>11}"
+        )
+        for chunk_count in args.chunks:
+            vectors = rng.standard_normal((chunk_count, args.dims)).astype(np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            queries = rng.standard_normal((args.queries, args.dims)).astype(np.float32)
+            for name in ["chroma", "numpy"]:
+                build, memory, query_latency = bench(
+                    name, vectors, queries, args.k, chroma_client
+                )
+                print(
+                    f"{chunk_count:>7} {name:>8} {build * 1000:>11.2f} "
+                    f"{memory / 1024:>12.0f} {query_latency * 1000:>11.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare float32, float16 and int8 NumPy storage: resident memory, recall@3, latency.
+
+Usage:
+    python -m benchmarks.bench_vector_quantization
+    python -m benchmarks.bench_vector_quantization --chunks 300 30000 --dims 512
+
+Chunk vectors are random unit vectors; every query is a noisy copy of one of
+them, so each has a clear nearest neighbour plus a realistic tail. Recall@3
+is measured against exact float32 search, once with re-scoring of the
+quantized shortlist (the default) and once without (shortlist = k).
+Collections are persisted to a temp dir so the float32 rows are memory-mapped.
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from utils.vector_backends import NumpyBackend
+
+
+def top_ids(backend, queries, k):
+    return [[doc.page_content for doc in backend.search(q, k)] for q in queries]
+
+
+def recall(results, reference):
+    return np.mean(
+        [len(set(got) & set(want)) / len(want) for got, want in zip(results, reference)]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, nargs="+", default=[300, 3000, 30000])
+    parser.add_argument("--dims", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--noise", type=float, default=1.0)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(
+        f"{'chunks':>7} {'storage':>8} {'RAM (KB)':>10} {'saved':>6} "
+        f"{'recall':>7} {'no rescore':>11} {'query (ms)':>11}"
+    )
+    for chunk_count in args.chunks:
+        vectors = rng.standard_normal((chunk_count, args.dims)).astype(np.float32)
+        picks = rng.integers(0, chunk_count, args.queries)
+        queries = vectors[picks] + args.noise * rng.standard_normal(
+            (args.queries, args.dims)
+        ).astype(np.float32)
+        ids = [f"chunk-{i}" for i in range(chunk_count)]
+        texts = ids
+        metadatas = [{} for _ in ids]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            reference = None
+            baseline_bytes = None
+            for quantization in NumpyBackend.QUANTIZATIONS:
+                backend = NumpyBackend(f"bench-{quantization}", tmp_dir, quantization)
+                backend.upsert(ids, vectors, texts, metadatas)
+                # Reopen, as a new process would: float32 rows memory-mapped
+                backend = NumpyBackend(f"bench-{quantization}", tmp_dir, quantization)
+
+                start = time.perf_counter()
+                results = top_ids(backend, queries, args.k)
+                latency = (time.perf_counter() - start) / args.queries
+                if reference is None:
+                    reference = results
+                    baseline_bytes = backend.memory_bytes()
+                backend.rescore_factor = 1
+                no_rescore = recall(top_ids(backend, queries, args.k), reference)
+
+                memory = backend.memory_bytes()
+                print(
+                    f"{chunk_count:>7} {quantization:>8} {memory / 1024:>10.0f} "
+                    f"{1 - memory / baseline_bytes:>6.0%} "
+                    f"{recall(results, reference):>7.3f} {no_rescore:>11.3f} "
+                    f"{latency * 1000:>11.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compare the recursive and section-aware chunkers on resume PDFs.
+
+Usage:
+    python -m benchmarks.chunk_report
+    python -m benchmarks.chunk_report --pdf resume.pdf cover_letter.pdf
+
+For every chunker this reports chunks per document, mean tokens per chunk,
+the tokens injected into the prompt per turn (k retrieved chunks) and how
+much text is duplicated by chunk overlap. Without ``--pdf`` a synthetic
+resume from ``benchmarks.sample_pdfs`` is used. No API calls are made.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+import config
+from benchmarks.sample_pdfs import write_sample_pdf
+from utils.ingestion import iter_pdf_pages
+from utils.resume_splitter import ResumeSectionSplitter
+from utils.token_counter import count_tokens
+
+
+def make_splitter(name: str):
+    if name == "recursive":
+        return RecursiveCharacterTextSplitter(
+            chunk_size=config.CHUNK_SIZE, chunk_overlap=config.CHUNK_OVERLAP
+        )
+    return ResumeSectionSplitter(max_chunk_size=config.CHUNK_SIZE)
+
+
+def report(name: str, pdf_paths, k: int):
+    chunk_counts, chunk_tokens, chunk_chars, source_chars = [], [], 0, 0
+    for pdf_path in pdf_paths:
+        pages = list(iter_pdf_pages([pdf_path]))
+        source_chars += sum(len(page.page_content) for page in pages)
+        # Split page by page, as ingestion does
+        splitter = make_splitter(name)
+        chunks = [chunk for page in pages for chunk in splitter.split_documents([page])]
+        chunk_counts.append(len(chunks))
+        chunk_tokens.extend(count_tokens(chunk.page_content) for chunk in chunks)
+        chunk_chars += sum(len(chunk.page_content) for chunk in chunks)
+
+    mean_tokens = statistics.mean(chunk_tokens) if chunk_tokens else 0.0
+    duplication = chunk_chars / source_chars - 1 if source_chars else 0.0
+    print(
+        f"{name:>10} {statistics.mean(chunk_counts):>13.1f} {mean_tokens:>12.1f} "
+        f"{k * mean_tokens:>13.0f} {duplication * 100:>12.1f}%"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdf", nargs="+", help="PDFs to report on")
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--k", type=int, default=config.RETRIEVAL_K_DOCUMENTS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_paths = args.pdf or [
+            write_sample_pdf(os.path.join(tmp_dir, "resume.pdf"), args.pages)
+        ]
+        print(
+            f"{'chunker':>10} {'chunks / doc':>13} {'tokens/chunk':>12} "
+            f"{'tokens/turn':>13} {'duplication':>13}"
+        )
+        for name in ["recursive", "section"]:
+            report(name, pdf_paths, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Generate synthetic resume-like PDFs of a given page count for benchmarks."""
+
+import os
+import random
+
+SECTIONS = ["Experience", "Projects", "Skills", "Education"]
+TITLES = ["Senior ML Engineer", "Data Engineer", "Software Engineer", "Tech Lead"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli"]
+TOOLS = [
+    "Python",
+    "PyTorch",
+    "TensorFlow",
+    "Kubernetes",
+    "Docker",
+    "Airflow",
+    "Spark",
+    "PostgreSQL",
+    "AWS",
+    "React",
+    "Go",
+    "Terraform",
+]
+VERBS = ["Built", "Led", "Designed", "Shipped", "Optimized", "Migrated", "Scaled"]
+OBJECTS = [
+    "a recommendation service",
+    "the data ingestion platform",
+    "an ML training pipeline",
+    "a real-time analytics dashboard",
+    "the CI/CD system",
+    "a customer-facing search API",
+]
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def sample_page_lines(page_number: int, rng: random.Random) -> list:
+    """About one page of resume text: headed sections, role titles and bullets."""
+    lines = []
+    while len(lines) < 40:
+        section = rng.choice(SECTIONS)
+        lines.append(section.upper())
+        if section == "Skills":
+            lines.append(", ".join(rng.sample(TOOLS, 8)))
+            continue
+        if section == "Education":
+            lines.append(
+                f"M.Sc. Computer Science, State University ({2010 + page_number % 10})"
+            )
+            continue
+        for _ in range(rng.randint(1, 3)):
+            lines.append(
+                f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} "
+                f"({rng.randint(2012, 2018)} - {rng.randint(2019, 2024)})"
+            )
+            for _ in range(rng.randint(2, 5)):
+                lines.append(
+                    f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using "
+                    f"{rng.choice(TOOLS)} and {rng.choice(TOOLS)}, improving "
+                    f"throughput by {rng.randint(5, 90)}%."
+                )
+    return lines
+
+
+def write_sample_pdf(path: str, pages: int, seed: int = 0) -> str:
+    """Write a plain-text PDF with ``pages`` pages that pypdf can extract."""
+    rng = random.Random(seed)
+    objects = []
+
+    # 1: catalog, 2: page tree, 3: font; pages start at 4
+    page_ids = [4 + 2 * i for i in range(pages)]
+    objects.append("<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{page_id} 0 R" for page_id in page_ids), pages
+        )
+    )
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    for page_number, page_id in enumerate(page_ids):
+        text_ops = ["BT", "/F1 9 Tf", "11 TL", "40 800 Td"]
+        for line in sample_page_lines(page_number, rng):
+            text_ops.append(f"({_escape(line)}) Tj T*")
+        text_ops.append("ET")
+        stream = "\n".join(text_ops)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        )
+        objects.append(
+            f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream"
+        )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode("latin-1")
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode("latin-1")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(output)
+    return path
@@ -0,0 +1,124 @@
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# Process-wide VectorDB cache: at most this many document sets stay indexed,
+# and an index that hasn't been touched for the TTL is dropped.
+INDEX_CACHE_MAX_ENTRIES = _env_int("INDEX_CACHE_MAX_ENTRIES", 16)
+INDEX_CACHE_TTL_SECONDS = _env_int("INDEX_CACHE_TTL_SECONDS", 3600)
+
+# Persisted collections (Chroma, or NumPy with NUMPY_PERSIST_DIR) not opened
+# for this long are deleted, and at most this many are kept on disk
+INDEX_RETENTION_SECONDS = _env_int("INDEX_RETENTION_SECONDS", 7 * 24 * 3600)
+INDEX_RETENTION_MAX_COLLECTIONS = _env_int("INDEX_RETENTION_MAX_COLLECTIONS", 200)
+
+# Text splitter settings used when chunking the uploaded PDFs. "section" keeps
+# one resume role/project per chunk; "recursive" is the plain character splitter
+# (CHUNK_OVERLAP only applies to it).
+CHUNKER = os.getenv("CHUNKER", "section").lower()
+CHUNK_SIZE = _env_int("CHUNK_SIZE", 1000)
+CHUNK_OVERLAP = _env_int("CHUNK_OVERLAP", 100)
+
+# On-disk per-chunk embedding cache shared by restarts and replicas
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", ".cache/embeddings.sqlite3")
+EMBEDDING_CACHE_MAX_ENTRIES = _env_int("EMBEDDING_CACHE_MAX_ENTRIES", 200_000)
+
+# Embedding pipeline: chunks per request, requests in flight, retry policy
+EMBED_BATCH_SIZE = _env_int("EMBED_BATCH_SIZE", 64)
+EMBED_MAX_CONCURRENCY = _env_int("EMBED_MAX_CONCURRENCY", 4)
+EMBED_MAX_RETRIES = _env_int("EMBED_MAX_RETRIES", 5)
+EMBED_TIMEOUT_SECONDS = _env_int("EMBED_TIMEOUT_SECONDS", 30)
+
+# PDF text extraction: worker processes (1 = extract in-process) and pages per task;
+# files of at most PDF_PAGES_PER_TASK pages are always extracted in-process
+PDF_EXTRACTION_WORKERS = _env_int("PDF_EXTRACTION_WORKERS", min(4, os.cpu_count() or 1))
+PDF_PAGES_PER_TASK = _env_int("PDF_PAGES_PER_TASK", 8)
+
+# How long a turn waits for upload-time indexing before answering without documents
+INDEX_READY_TIMEOUT_SECONDS = _env_int("INDEX_READY_TIMEOUT_SECONDS", 20)
+
+# Persistent Chroma directory holding per-candidate collections
+CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", ".cache/chroma")
+
+# Chunks retrieved per turn from each namespace
+RETRIEVAL_K_DOCUMENTS = _env_int("RETRIEVAL_K_DOCUMENTS", 3)
+RETRIEVAL_K_JOB_DESCRIPTION = _env_int("RETRIEVAL_K_JOB_DESCRIPTION", 2)
+
+# Vector storage: "chroma" (persistent) or "numpy" (in-memory brute force)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma").lower()
+
+# NumPy backend: where collections are saved ("" = memory only) and how the
+# resident vectors are stored: "none" (float32), "float16" or "int8". Quantized
+# top candidates are re-scored against the float32 rows, which stay on disk
+# (memory-mapped); quantization therefore needs a persist directory.
+NUMPY_PERSIST_DIR = os.getenv("NUMPY_PERSIST_DIR", ".cache/numpy")
+VECTOR_QUANTIZATION = os.getenv("VECTOR_QUANTIZATION", "none").lower()
+
+# Per-turn query caches: query embeddings and top-k results (per index version)
+QUERY_CACHE_MAX_ENTRIES = _env_int("QUERY_CACHE_MAX_ENTRIES", 1024)
+QUERY_CACHE_TTL_SECONDS = _env_int("QUERY_CACHE_TTL_SECONDS", 3600)
+
+# Retrieval: "hybrid" (BM25 + vectors, fused), "vector" or "lexical" (BM25 only).
+# In hybrid mode a query embedding slower than the budget (or failing) is
+# skipped and the turn uses the local BM25 results alone.
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid").lower()
+QUERY_EMBED_BUDGET_MS = _env_int("QUERY_EMBED_BUDGET_MS", 800)
+
+# Decide per turn whether to retrieve at all, how many chunks, or to reuse the
+# previous turn's context (0 = always retrieve the full k)
+ADAPTIVE_RETRIEVAL = _env_int("ADAPTIVE_RETRIEVAL", 1) != 0
+
+# Chunks per namespace in each precomputed interview-stage context pack
+STAGE_CONTEXT_K = _env_int("STAGE_CONTEXT_K", 2)
+
+# Shared HTTP connection pool for OpenAI calls (chat, speech, transcription)
+HTTP_MAX_CONNECTIONS = _env_int("HTTP_MAX_CONNECTIONS", 20)
+HTTP_KEEPALIVE_SECONDS = _env_int("HTTP_KEEPALIVE_SECONDS", 120)
+OPENAI_TIMEOUT_SECONDS = _env_int("OPENAI_TIMEOUT_SECONDS", 60)
+
+# Prompt context budgets (tokens) for retrieved document and job description
+# chunks. The first two bound the reference material at the start of the
+# prompt (the same every turn, so it can be cached); the third bounds chunks
+# retrieved for the latest message, which go at the end.
+CONTEXT_TOKEN_BUDGET = _env_int("CONTEXT_TOKEN_BUDGET", 900)
+JOB_DESCRIPTION_TOKEN_BUDGET = _env_int("JOB_DESCRIPTION_TOKEN_BUDGET", 300)
+TURN_CONTEXT_TOKEN_BUDGET = _env_int("TURN_CONTEXT_TOKEN_BUDGET", 400)
+
+# Embeddings: "openai", "local" (sentence-transformers if installed, else
+# hashing) or "hashing" (hashed character n-grams; no network at all)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai").lower()
+LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+# OpenAI embedding model and output dimensionality (0 = the model's native
+# size). Reduced dimensions need a text-embedding-3 model, e.g.
+# EMBEDDING_MODEL=text-embedding-3-small EMBEDDING_DIMENSIONS=512. Also sets
+# the size of the hashing embeddings (default 512).
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002")
+EMBEDDING_DIMENSIONS = _env_int("EMBEDDING_DIMENSIONS", 0)
+
+# Text-to-speech for interviewer replies: sentences are synthesized on
+# TTS_WORKERS threads while the reply is still streaming
+TTS_MODEL = os.getenv("TTS_MODEL", "tts-1")
+TTS_VOICE = os.getenv("TTS_VOICE", "nova")
+TTS_WORKERS = _env_int("TTS_WORKERS", 3)
+
+# Interview length: questions the interviewer asks after the greeting
+MAX_QUESTIONS = _env_int("MAX_QUESTIONS", 3)
+
+# Conversation history sent with each turn: the last MEMORY_RECENT_TURNS
+# question/answer pairs verbatim plus a rolling summary of the earlier ones
+# (written by SUMMARY_MODEL in the background), within HISTORY_TOKEN_BUDGET
+MEMORY_RECENT_TURNS = _env_int("MEMORY_RECENT_TURNS", 4)
+HISTORY_TOKEN_BUDGET = _env_int("HISTORY_TOKEN_BUDGET", 1500)
+SUMMARY_TOKEN_BUDGET = _env_int("SUMMARY_TOKEN_BUDGET", 300)
+SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "gpt-4o-mini")
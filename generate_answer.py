@@ -8,65 +8,1028 @@ except ImportError:
     pass
 
 import os
+import json
+import hashlib
+import time
 import logging
+import threading
+import weakref
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from glob import glob
 from typing import List, Optional
 
 import openai
-from openai import OpenAI
 from dotenv import load_dotenv
 
-from langchain.embeddings import OpenAIEmbeddings
-from langchain.vectorstores import Chroma
-from langchain.document_loaders import PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
 
-from langchain_community.chat_models import ChatOpenAI
 from langchain.chains import RetrievalQA
 from langchain.memory import ConversationBufferMemory
 
+import config
+from utils.lru_cache import LRUCache
+from utils.embedding_cache import CachedEmbeddings
+from utils.embedding_backends import create_embeddings
+from utils.ingestion import (
+    iter_pdf_pages,
+    iter_chunk_batches,
+    stream_embeddings,
+    file_digest,
+    chunk_id,
+)
+from utils.pdf_extraction import iter_pdf_pages_parallel
+from utils.shared_index import MappedBackend
+from utils.vector_backends import (
+    create_backend,
+    delete_stored_collection,
+    stored_collections,
+)
+from utils.resume_splitter import ResumeSectionSplitter
+from utils.lexical_index import BM25Index, reciprocal_rank_fusion, tokenize
+from utils.retrieval_policy import decide_retrieval, record_decision, policy_stats
+from utils.context_assembler import assemble_context, assembly_stats
+from utils.conversation_memory import ConversationMemory, message_tokens
+from utils.prompt_assembly import assemble_messages, record_usage, prompt_cache_stats
+from utils.client_pool import (
+    get_chat_model,
+    get_openai_client,
+    connection_usage,
+    tracer,
+)
+
 load_dotenv()
 api_key = os.getenv("OPENAI_API_KEY")
-
-client = OpenAI(api_key=api_key)
 openai.api_key = api_key
 
+# Process-wide cache of built indexes, keyed by document content + settings.
+# Streamlit reruns the script on every interaction, but imported modules (and
+# therefore this cache) live for the whole server process.
+index_cache = LRUCache(
+    max_entries=config.INDEX_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.INDEX_CACHE_TTL_SECONDS,
+    on_evict=lambda vector_db: vector_db.close(),
+)
+
+# Query-side caches. Streamlit reruns replay the same turn, and candidates
+# repeat themselves; neither should cost another embedding round-trip. Query
+# vectors only depend on the text, results also on the index version.
+query_embedding_cache = LRUCache(
+    max_entries=config.QUERY_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.QUERY_CACHE_TTL_SECONDS,
+)
+retrieval_cache = LRUCache(
+    max_entries=config.QUERY_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.QUERY_CACHE_TTL_SECONDS,
+)
+
+# Query embeddings run here so a turn can stop waiting after the latency
+# budget; a late embedding still lands in query_embedding_cache
+_query_embed_executor = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="query-embed"
+)
+# How each search was served: hybrid, vector, lexical or lexical_fallback
+retrieval_counters = Counter()
+# Interviewer reply latency, summed over streamed turns
+generation_timings = Counter()
+
+_embeddings = None
+_chroma_client = None
+_chroma_client_lock = threading.Lock()
+
+# Persisted collections are checked against the retention bound at most this often
+RETENTION_SWEEP_INTERVAL_SECONDS = 3600
+_last_retention_sweep = None
+_retention_lock = threading.Lock()
+
+# Metadata namespaces inside a collection: the candidate's own documents
+# (resume, cover letter) and the job description they're interviewing for
+DOCUMENTS_NAMESPACE = "documents"
+JOB_DESCRIPTION_NAMESPACE = "job_description"
+
+# What each interview stage should focus on. Also used as the retrieval query
+# for the stage's precomputed context pack.
+STAGE_GUIDANCE = {
+    "introduction": "Establish rapport and gather general background, inviting the candidate to share their journey and inspiration in their field.",
+    "technical": "Focus on core skills and projects by exploring specific technical challenges and problem-solving approaches relevant to their expertise.",
+    "behavioral": "Investigate softskill and interpersonal experiences by examining how the candidate handled teamwork, conflict, and leadership situations.",
+    "experience": "Explore details from the candidate's resume and cover letter, highlighting key achievements and the strategies behind them.",
+    "closing": "Summarize the discussion and invite reflection on future goals, ensuring an opportunity for the candidate to share any final thoughts.",
+}
+
+
+def get_embeddings() -> CachedEmbeddings:
+    """Shared embeddings (per EMBEDDING_BACKEND), fronted by the on-disk per-chunk cache."""
+    global _embeddings
+    if _embeddings is None:
+        # Retries are handled per batch by the ingestion pipeline
+        _embeddings = CachedEmbeddings(
+            create_embeddings(
+                config.EMBEDDING_BACKEND,
+                model_name=config.EMBEDDING_MODEL,
+                dimensions=config.EMBEDDING_DIMENSIONS or None,
+                local_model_name=config.LOCAL_EMBEDDING_MODEL,
+                max_retries=0,
+                request_timeout=config.EMBED_TIMEOUT_SECONDS,
+            ),
+            db_path=config.EMBEDDING_CACHE_PATH,
+            max_entries=config.EMBEDDING_CACHE_MAX_ENTRIES,
+        )
+    return _embeddings
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, used as a cache key."""
+    return " ".join(query.split()).casefold()
+
+
+def embed_query(query: str) -> List[float]:
+    """Embedding for a query, served from the in-process cache when possible."""
+    embeddings = get_embeddings()
+    return query_embedding_cache.get_or_create(
+        (embeddings.model_name, embeddings.dimensions, normalize_query(query)),
+        lambda: embeddings.embed_query(query),
+    )
+
+
+def embed_query_within_budget(query: str, budget_seconds: float):
+    """Query embedding, or None if it takes longer than the budget or fails."""
+    future = _query_embed_executor.submit(embed_query, query)
+    try:
+        return future.result(timeout=budget_seconds)
+    except FutureTimeoutError:
+        logging.warning(
+            f"Query embedding exceeded {budget_seconds * 1000:.0f}ms; "
+            "using lexical retrieval"
+        )
+    except Exception as e:
+        logging.error(f"Query embedding failed, using lexical retrieval: {str(e)}")
+    return None
+
+
+def retrieval_stats() -> dict:
+    return {
+        "query_embeddings": query_embedding_cache.stats(),
+        "results": retrieval_cache.stats(),
+        "modes": dict(retrieval_counters),
+    }
+
+
+def generation_stats() -> dict:
+    """Average time to first token and total reply time per turn, in seconds."""
+    turns = generation_timings["turns"]
+    if not turns:
+        return {"turns": 0}
+    return {
+        "turns": turns,
+        "avg_ttft_seconds": round(generation_timings["ttft_seconds"] / turns, 3),
+        "avg_total_seconds": round(generation_timings["total_seconds"] / turns, 3),
+    }
+
+
+def stream_chat(
+    messages: List[dict],
+    model_name: str = "gpt-4o",
+    temperature: float = 0,
+    metrics: Optional[dict] = None,
+):
+    """Stream a chat completion's text from the pooled client.
+
+    The final chunk's usage (including prompt tokens served from the
+    provider's prefix cache) is recorded, and copied into ``metrics``.
+    """
+    # Created on first use, so importing this module needs no API key
+    stream = get_openai_client().chat.completions.create(
+        model=model_name,
+        messages=messages,
+        temperature=temperature,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    for chunk in stream:
+        if chunk.usage is not None:
+            record_usage(chunk.usage, metrics)
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def get_chroma_client():
+    """Process-wide persistent Chroma client; collections survive restarts."""
+    global _chroma_client
+    # Ingestion and the retention sweep may ask for it at the same moment;
+    # two clients initializing the same directory at once fail
+    with _chroma_client_lock:
+        if _chroma_client is None:
+            # Imported lazily so the NumPy backend never loads Chroma (or SQLite)
+            import chromadb
+
+            os.makedirs(config.CHROMA_PERSIST_DIR, exist_ok=True)
+            _chroma_client = chromadb.PersistentClient(path=config.CHROMA_PERSIST_DIR)
+        return _chroma_client
+
+
+def make_text_splitter():
+    """Splitter for one document, per the CHUNKER setting."""
+    if config.CHUNKER == "recursive":
+        # start_index lets the context assembler merge neighbouring chunks
+        return RecursiveCharacterTextSplitter(
+            chunk_size=config.CHUNK_SIZE,
+            chunk_overlap=config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+    return ResumeSectionSplitter(max_chunk_size=config.CHUNK_SIZE)
+
+
+def text_digest(namespace: str, text: str) -> str:
+    """Document ID for a piece of plain text indexed under ``namespace``."""
+    return hashlib.sha256(f"{namespace}:{text.strip()}".encode("utf-8")).hexdigest()
+
 
 class VectorDB:
-    """Class to manage document loading and vector database creation."""
+    """Class to manage document loading and vector database creation.
+
+    Each VectorDB is backed by a collection in the configured vector backend
+    (a persistent Chroma collection, or a NumPy matrix for small corpora,
+    optionally quantized and saved to disk) holding any number of documents.
+    Documents are identified by the SHA-256 of their bytes and chunks by a
+    hash of their content, so adding a document that is already indexed
+    costs nothing and swapping one document only touches that document's
+    chunks.
+
+    Next to the vectors, every chunk is also kept in a local BM25 index, so
+    exact terms (tool names, employers) can be matched without an embedding
+    call; ``search`` fuses both rankings (see RETRIEVAL_MODE).
+
+    Once ingestion finishes, a context pack per interview stage (the chunks
+    closest to that stage's STAGE_GUIDANCE) is precomputed, so the first
+    question of a stage doesn't wait on retrieval.
+
+    Ingestion runs on background threads, page by page: each page is split,
+    embedded and written to the collection before the next pages are read.
+    The index becomes queryable as soon as the first batch lands; use
+    ``wait_until_queryable`` / ``wait_until_complete`` to wait for it.
+    """
+
+    # Collection metadata key prefix marking a fully ingested document
+    COMPLETE_PREFIX = "complete:"
+    # Collection metadata key: when the collection was last opened (epoch
+    # seconds), for the retention sweep
+    LAST_USED_KEY = "last_used"
 
-    def __init__(self, pdf_paths: List[str]):
-        self.pdf_paths = pdf_paths
+    def __init__(
+        self,
+        pdf_paths: List[str],
+        collection_name: Optional[str] = None,
+        job_description: Optional[str] = None,
+        backend=None,
+    ):
+        self.pdf_paths = []
+        self.collection_name = collection_name or (
+            f"docs-{document_fingerprint(pdf_paths, job_description)[:40]}"
+        )
+        self.documents = {}  # doc_id -> pdf path, for every document in the index
+        self.error = None
+        self._pending = set()  # doc_ids still being ingested
+        self._cancelled = set()
+        self._lock = threading.RLock()
+        self._queryable = threading.Event()
+        self._complete = threading.Event()
+        self._complete.set()
+        self._closed = False
+        # Bumped on every write, so cached search results never outlive a change
+        self.version = 0
+        self.lexical = BM25Index()
+        self._stage_packs = None  # {"version": ..., "packs": {stage: {ns: docs}}}
+        self._building_stage_packs = False
+        self.read_only = False
+        self._stamped_at = 0.0  # when LAST_USED_KEY was last written
         try:
-            self.vector_store = self.create_vector_db()
+            self.backend = backend or create_backend(
+                config.VECTOR_BACKEND,
+                self.collection_name,
+                get_chroma_client,
+                persist_dir=config.NUMPY_PERSIST_DIR or None,
+                quantization=config.VECTOR_QUANTIZATION,
+            )
+            # e.g. a shared, memory-mapped index: searchable but never written
+            self.read_only = getattr(self.backend, "read_only", False)
             self.is_available = True
+            self._load_existing_documents()
         except Exception as e:
-            logging.error(f"Failed to create vector database: {str(e)}")
-            self.vector_store = None
-            self.is_available = False
-            print(
-                f"Warning: Vector database creation failed. Falling back to standard chat mode. Error: {str(e)}"
+            self._mark_failed(e)
+            return
+
+        self.sync_documents(pdf_paths, job_description)
+
+    def _mark_failed(self, e: Exception):
+        logging.error(f"Failed to create vector database: {str(e)}")
+        self.error = e
+        self.backend = None
+        self.is_available = False
+        self._queryable.set()
+        self._complete.set()
+        print(
+            f"Warning: Vector database creation failed. Falling back to standard chat mode. Error: {str(e)}"
+        )
+
+    @staticmethod
+    def index_settings() -> dict:
+        """Settings that change the resulting index and so belong in its cache key."""
+        return {
+            "chunker": config.CHUNKER,
+            "chunk_size": config.CHUNK_SIZE,
+            "chunk_overlap": config.CHUNK_OVERLAP,
+            # The model actually in use (a "local" backend may fall back)
+            "embeddings": get_embeddings().model_name,
+            "embedding_dimensions": get_embeddings().dimensions,
+            "backend": config.VECTOR_BACKEND,
+            # Chunks carry a "namespace" in their metadata
+            "namespaces": True,
+        }
+
+    def _load_existing_documents(self):
+        """Pick up documents a previous process already finished indexing."""
+        metadata = self.backend.get_metadata()
+        # Record which embeddings the vectors come from; queries must match
+        embeddings = get_embeddings()
+        embedding_info = {
+            "embedding_model": embeddings.model_name,
+            "embedding_dimensions": embeddings.dimensions or 0,
+        }
+        stored_info = {key: metadata[key] for key in embedding_info if key in metadata}
+        if stored_info and stored_info != embedding_info:
+            raise ValueError(
+                f"Collection {self.collection_name} was built with {stored_info}, "
+                f"not {embedding_info}"
+            )
+        if not self.read_only:
+            self.backend.set_metadata(
+                {**metadata, **embedding_info, self.LAST_USED_KEY: time.time()}
             )
+            self._stamped_at = time.time()
+        for key in metadata:
+            if key.startswith(self.COMPLETE_PREFIX):
+                self.documents[key[len(self.COMPLETE_PREFIX) :]] = None
+        if self.chunk_count > 0:
+            # The BM25 index lives in memory only; rebuild it from stored chunks.
+            # Not for read-only indexes: it would copy the whole shared corpus
+            # into every process, so those are searched by vector only.
+            if not self.read_only:
+                self.lexical.upsert(*self.backend.all_chunks())
+            self._queryable.set()
 
-    def create_vector_db(self):
-        if not self.pdf_paths:
-            return None
+    def touch(self):
+        """Refresh the collection's last-used stamp, at most once a sweep interval."""
+        if not self.is_available or self.read_only:
+            return
+        if time.time() - self._stamped_at < RETENTION_SWEEP_INTERVAL_SECONDS:
+            return
+        with self._lock:
+            metadata = self.backend.get_metadata()
+            metadata[self.LAST_USED_KEY] = time.time()
+            self.backend.set_metadata(metadata)
+            self._stamped_at = time.time()
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000, chunk_overlap=100
+    def _set_document_complete(self, doc_id: str, complete: bool):
+        with self._lock:
+            metadata = self.backend.get_metadata()
+            key = f"{self.COMPLETE_PREFIX}{doc_id}"
+            if complete:
+                metadata[key] = 1
+            else:
+                metadata.pop(key, None)
+            self.backend.set_metadata(metadata)
+
+    def sync_documents(
+        self, pdf_paths: List[str], job_description: Optional[str] = None
+    ):
+        """Make the index contain exactly these PDFs (and job description).
+
+        Documents already indexed are left alone, documents no longer listed
+        are removed, and only new documents are ingested.
+        """
+        if not self.is_available:
+            return
+        if self.read_only:
+            self._queryable.set()
+            self._schedule_stage_packs()
+            return
+        wanted = {file_digest(pdf_path): pdf_path for pdf_path in pdf_paths}
+        job_description_id = None
+        if job_description and job_description.strip():
+            job_description_id = text_digest(JOB_DESCRIPTION_NAMESPACE, job_description)
+            wanted[job_description_id] = None
+        with self._lock:
+            self.pdf_paths = list(pdf_paths)
+            for doc_id in list(self.documents):
+                if doc_id not in wanted:
+                    self.remove_document(doc_id)
+            for doc_id, pdf_path in wanted.items():
+                if doc_id in self.documents:
+                    if self.documents[doc_id] is None:
+                        self.documents[doc_id] = pdf_path
+                elif doc_id == job_description_id:
+                    self.add_text(job_description, JOB_DESCRIPTION_NAMESPACE, doc_id)
+                else:
+                    self.add_document(pdf_path, doc_id)
+            if not self._pending:
+                # Nothing to wait for; don't leave callers blocked on an empty index
+                self._queryable.set()
+                self._schedule_stage_packs()
+
+    def add_document(self, pdf_path: str, doc_id: Optional[str] = None) -> str:
+        """Ingest one PDF in the background; a no-op if it is already indexed."""
+        doc_id = doc_id or file_digest(pdf_path)
+        return self._start_ingest(
+            doc_id, pdf_path, pdf_path, lambda: self._load_pdf_pages(pdf_path)
         )
 
-        # Load and split each PDF document
-        pdf_docs = []
-        for pdf_path in self.pdf_paths:
-            loader = PyPDFLoader(pdf_path)
-            pdf_docs.extend(loader.load())
-        chunks = text_splitter.split_documents(pdf_docs)
+    def add_text(self, text: str, namespace: str, doc_id: Optional[str] = None) -> str:
+        """Ingest plain text (e.g. the job description) into its own namespace."""
+        doc_id = doc_id or text_digest(namespace, text)
+        return self._start_ingest(
+            doc_id,
+            None,
+            namespace,
+            lambda: iter([Document(page_content=text, metadata={"source": namespace})]),
+            namespace,
+        )
+
+    def _start_ingest(
+        self,
+        doc_id: str,
+        pdf_path: Optional[str],
+        label: str,
+        load_pages,
+        namespace: str = DOCUMENTS_NAMESPACE,
+    ) -> str:
+        with self._lock:
+            if doc_id in self.documents:
+                return doc_id
+            self.documents[doc_id] = pdf_path
+            self._cancelled.discard(doc_id)
+            self._pending.add(doc_id)
+            self._complete.clear()
+
+        threading.Thread(
+            target=self._ingest,
+            args=(doc_id, label, load_pages, namespace),
+            name=f"ingest-{doc_id[:12]}",
+            daemon=True,
+        ).start()
+        return doc_id
+
+    def remove_document(self, doc_id: str):
+        """Drop one document's chunks from the index."""
+        with self._lock:
+            self.documents.pop(doc_id, None)
+            if doc_id in self._pending:
+                # The ingest thread cleans up after itself when it notices
+                self._cancelled.add(doc_id)
+            self.backend.delete(where={"doc_id": doc_id})
+            self.lexical.delete(where={"doc_id": doc_id})
+            self._set_document_complete(doc_id, False)
+            self.version += 1
+        logging.info(f"Removed document {doc_id[:12]} from {self.collection_name}")
+
+    def _ingest(self, doc_id: str, label: str, load_pages, namespace: str):
+        try:
+            finished = self.create_vector_db(doc_id, label, load_pages(), namespace)
+            with self._lock:
+                if doc_id in self._cancelled:
+                    self.backend.delete(where={"doc_id": doc_id})
+                    self.lexical.delete(where={"doc_id": doc_id})
+                    self.version += 1
+                elif finished:
+                    self._set_document_complete(doc_id, True)
+                else:
+                    # Closed mid-ingest: the chunks written so far stay, but
+                    # without the marker the next open ingests the rest
+                    logging.info(f"Ingestion of {label} stopped before the end")
+        except Exception as e:
+            logging.error(f"Ingestion of {label} stopped: {str(e)}")
+            self.error = e
+            with self._lock:
+                self.documents.pop(doc_id, None)
+            if self.chunk_count == 0 and not self._pending - {doc_id}:
+                self._mark_failed(e)
+        finally:
+            with self._lock:
+                self._pending.discard(doc_id)
+                self._cancelled.discard(doc_id)
+                if not self._pending:
+                    self._queryable.set()
+                    self._complete.set()
+                    self._schedule_stage_packs()
+
+    def _new_chunks(self, chunk_batches, doc_id: str, namespace: str):
+        """Tag chunks with content IDs and drop the ones already in the collection."""
+        seen = set()
+        for batch in chunk_batches:
+            fresh = []
+            for chunk in batch:
+                chunk.metadata["namespace"] = namespace
+                chunk.metadata["doc_id"] = doc_id
+                chunk.metadata["chunk_id"] = chunk_id(doc_id, chunk.page_content)
+                if chunk.metadata["chunk_id"] not in seen:
+                    seen.add(chunk.metadata["chunk_id"])
+                    fresh.append(chunk)
+            if not fresh:
+                continue
+            existing = self.backend.existing_ids(
+                [chunk.metadata["chunk_id"] for chunk in fresh]
+            )
+            fresh = [c for c in fresh if c.metadata["chunk_id"] not in existing]
+            if fresh:
+                yield fresh
+
+    @staticmethod
+    def _load_pdf_pages(pdf_path: str):
+        if config.PDF_EXTRACTION_WORKERS > 1:
+            # Parse pages in worker processes so pypdf doesn't hold the GIL
+            # that every other session's script thread needs
+            return iter_pdf_pages_parallel(
+                [pdf_path],
+                max_workers=config.PDF_EXTRACTION_WORKERS,
+                pages_per_task=config.PDF_PAGES_PER_TASK,
+            )
+        return iter_pdf_pages([pdf_path])
+
+    def create_vector_db(
+        self, doc_id: str, label: str, pages, namespace: str = DOCUMENTS_NAMESPACE
+    ) -> bool:
+        """Stream one document: pages -> chunks -> embeddings -> collection.
+
+        Returns False if the index was closed or the document removed before
+        every chunk was written.
+        """
+        text_splitter = make_text_splitter()
+        embeddings = get_embeddings()
+        chunk_batches = self._new_chunks(
+            iter_chunk_batches(pages, text_splitter, config.EMBED_BATCH_SIZE),
+            doc_id,
+            namespace,
+        )
+
+        start = time.perf_counter()
+        added = 0
+        for chunks, vectors in stream_embeddings(
+            chunk_batches,
+            embeddings,
+            max_concurrency=config.EMBED_MAX_CONCURRENCY,
+            max_retries=config.EMBED_MAX_RETRIES,
+        ):
+            if self._closed or doc_id in self._cancelled:
+                return False
+            ids = [chunk.metadata["chunk_id"] for chunk in chunks]
+            texts = [chunk.page_content for chunk in chunks]
+            metadatas = [chunk.metadata for chunk in chunks]
+            self.backend.upsert(
+                ids=ids, vectors=vectors, texts=texts, metadatas=metadatas
+            )
+            self.lexical.upsert(ids, texts, metadatas)
+            with self._lock:
+                self.version += 1
+            added += len(chunks)
+            if not self._queryable.is_set():
+                logging.info(
+                    f"Index {self.collection_name} queryable after "
+                    f"{time.perf_counter() - start:.3f}s ({added} chunks)"
+                )
+                self._queryable.set()
+
+        logging.info(
+            f"Indexed {label} into {self.collection_name}: {added} new chunks "
+            f"in {time.perf_counter() - start:.3f}s"
+        )
+        logging.info(f"Embedding cache stats: {embeddings.stats()}")
+        return True
+
+    def _schedule_stage_packs(self):
+        """Rebuild the stage context packs in the background if the index changed."""
+        with self._lock:
+            if (
+                self._closed
+                or self._building_stage_packs
+                or not self.is_queryable
+                or (self._stage_packs and self._stage_packs["version"] == self.version)
+            ):
+                return
+            self._building_stage_packs = True
+        threading.Thread(
+            target=self._build_stage_packs,
+            name=f"stage-packs-{self.collection_name[:20]}",
+            daemon=True,
+        ).start()
+
+    def _build_stage_packs(self):
+        try:
+            version = self.version
+            k_per_namespace = {
+                DOCUMENTS_NAMESPACE: min(
+                    config.STAGE_CONTEXT_K, config.RETRIEVAL_K_DOCUMENTS
+                ),
+                JOB_DESCRIPTION_NAMESPACE: min(
+                    config.STAGE_CONTEXT_K, config.RETRIEVAL_K_JOB_DESCRIPTION
+                ),
+            }
+            start = time.perf_counter()
+            packs = {
+                stage: self.search_namespaces(
+                    guidance,
+                    {namespace: k for namespace, k in k_per_namespace.items() if k > 0},
+                    blocking=True,
+                )
+                for stage, guidance in STAGE_GUIDANCE.items()
+            }
+            self._stage_packs = {"version": version, "packs": packs}
+            logging.info(
+                f"Built stage context packs for {self.collection_name} "
+                f"in {time.perf_counter() - start:.3f}s"
+            )
+        except Exception as e:
+            logging.error(f"Failed to build stage context packs: {str(e)}")
+        finally:
+            with self._lock:
+                self._building_stage_packs = False
+        # Documents may have changed while the packs were being built
+        if self.version != version and not self._pending:
+            self._schedule_stage_packs()
+
+    def reference_context(self) -> dict:
+        """Every stage's context pack merged: the same chunks on every turn.
+
+        Empty until the packs are built; changes only when the documents do.
+        """
+        packs = self._stage_packs
+        if packs is None:
+            return {}
+        return merge_contexts(*packs["packs"].values())
 
-        if not chunks:
+    def stage_context(self, stage: str) -> Optional[dict]:
+        """Precomputed {namespace: [Document, ...]} for an interview stage, if built.
+
+        Packs from before the latest document change are still returned
+        (a refresh is already under way) rather than blocking the turn.
+        """
+        packs = self._stage_packs
+        if packs is None:
             return None
+        return packs["packs"].get(stage)
+
+    @property
+    def chunk_count(self) -> int:
+        if self.backend is None:
+            return 0
+        return self.backend.count()
+
+    @property
+    def is_queryable(self) -> bool:
+        """True once at least one chunk can be retrieved."""
+        return self.is_available and self.chunk_count > 0
 
-        return Chroma.from_documents(chunks, OpenAIEmbeddings())
+    @property
+    def is_complete(self) -> bool:
+        return self._complete.is_set()
+
+    def wait_until_queryable(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first chunks are searchable (or ingestion ends)."""
+        self._queryable.wait(timeout)
+        return self.is_queryable
+
+    def wait_until_complete(self, timeout: Optional[float] = None) -> bool:
+        return self._complete.wait(timeout)
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        namespace: Optional[str] = None,
+        blocking: bool = False,
+    ) -> List[Document]:
+        """Top-k chunks for a query, optionally restricted to one namespace."""
+        return self.search_namespaces(query, {namespace: k}, blocking)[namespace]
+
+    def search_namespaces(
+        self, query: str, k_per_namespace: dict, blocking: bool = False
+    ) -> dict:
+        """{namespace: top-k chunks} for one query ({namespace or None: k}).
+
+        In hybrid mode the vector and BM25 rankings are merged with reciprocal
+        rank fusion. The query is embedded once for all namespaces; if that
+        misses QUERY_EMBED_BUDGET_MS or fails, every namespace gets its BM25
+        results alone (not cached, so a later call can still get the fused
+        ranking); ``blocking`` waits for the embedding instead. Results are
+        cached per (index version, normalized query, k, namespace).
+        Read-only indexes have no BM25 index and are always searched by vector.
+        """
+        if not self.is_queryable:
+            return {namespace: [] for namespace in k_per_namespace}
+        mode = "vector" if self.read_only else config.RETRIEVAL_MODE
+        results, keys = {}, {}
+        for namespace, k in k_per_namespace.items():
+            if k <= 0:
+                results[namespace] = []
+                continue
+            key = (
+                self.collection_name,
+                self.version,
+                mode,
+                normalize_query(query),
+                k,
+                namespace,
+            )
+            cached = retrieval_cache.get(key)
+            if cached is not None:
+                results[namespace] = list(cached)
+            else:
+                keys[namespace] = key
+        if not keys:
+            return results
+
+        query_vector = None
+        if mode == "vector" or (mode != "lexical" and blocking):
+            query_vector = embed_query(query)
+        elif mode != "lexical":
+            query_vector = embed_query_within_budget(
+                query, config.QUERY_EMBED_BUDGET_MS / 1000
+            )
+        for namespace, key in keys.items():
+            k = k_per_namespace[namespace]
+            where = {"namespace": namespace} if namespace else None
+            if mode == "lexical":
+                found = self.lexical.search(query, k, where)
+            elif mode == "vector":
+                found = self.backend.search(query_vector, k, where)
+            elif query_vector is None:
+                retrieval_counters["lexical_fallback"] += 1
+                results[namespace] = self.lexical.search(query, k, where)
+                continue
+            else:
+                # Fetch deeper than k from each side so fusion has room to reorder
+                found = reciprocal_rank_fusion(
+                    [
+                        self.backend.search(query_vector, 2 * k, where),
+                        self.lexical.search(query, 2 * k, where),
+                    ],
+                    k,
+                )
+            retrieval_counters[mode] += 1
+            retrieval_cache.put(key, found)
+            results[namespace] = list(found)
+        return results
+
+    def close(self):
+        """Stop background ingestion. The persisted collection is kept."""
+        self._closed = True
+
+    def delete(self):
+        """Stop ingestion and drop the persisted collection entirely."""
+        self.close()
+        if self.backend is not None:
+            try:
+                self.backend.delete_collection()
+                self.lexical.clear()
+            except Exception as e:
+                logging.error(
+                    f"Failed to delete collection {self.collection_name}: {str(e)}"
+                )
+            self.backend = None
+            self.is_available = False
+
+
+def settings_fingerprint() -> str:
+    key_material = json.dumps(VectorDB.index_settings(), sort_keys=True)
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+
+def document_fingerprint(
+    pdf_paths: List[str], job_description: Optional[str] = None
+) -> str:
+    """SHA-256 over the PDF bytes, the job description and the index settings.
+
+    The temp file names change every session, so the key is built from the
+    file contents; the digests are sorted so upload order doesn't matter.
+    """
+    files = sorted(file_digest(pdf_path) for pdf_path in pdf_paths)
+    if job_description and job_description.strip():
+        files.append(text_digest(JOB_DESCRIPTION_NAMESPACE, job_description))
+    key_material = json.dumps(
+        {"files": files, "settings": VectorDB.index_settings()},
+        sort_keys=True,
+    )
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+
+def prune_stored_collections() -> List[str]:
+    """Delete persisted collections past the retention bound; returns their names.
+
+    Collections not opened for INDEX_RETENTION_SECONDS go, and beyond
+    INDEX_RETENTION_MAX_COLLECTIONS the least recently opened go first.
+    Never deleted: collections of indexes open in this process, collections
+    used recently enough that another worker may still have them open (or be
+    building them), and collections without a last-used stamp.
+    """
+    persist_dir = config.NUMPY_PERSIST_DIR or None
+    open_names = {vector_db.collection_name for vector_db in index_cache.values()}
+    stored = stored_collections(config.VECTOR_BACKEND, get_chroma_client, persist_dir)
+    # Open indexes re-stamp themselves at least once a sweep interval and are
+    # dropped from a worker's cache after INDEX_CACHE_TTL_SECONDS idle
+    in_use_cutoff = time.time() - (
+        config.INDEX_CACHE_TTL_SECONDS + 2 * RETENTION_SWEEP_INTERVAL_SECONDS
+    )
+    # Only collections this module names; anything else in the store is left alone
+    by_recency = sorted(
+        (
+            (metadata[VectorDB.LAST_USED_KEY], name)
+            for name, metadata in stored.items()
+            if name not in open_names
+            and name.startswith(("docs-", "candidate-"))
+            and VectorDB.LAST_USED_KEY in metadata
+        ),
+        reverse=True,
+    )
+    keep = max(0, config.INDEX_RETENTION_MAX_COLLECTIONS - len(open_names))
+    cutoff = time.time() - config.INDEX_RETENTION_SECONDS
+    deleted = []
+    for position, (last_used, name) in enumerate(by_recency):
+        if last_used >= in_use_cutoff or (position < keep and last_used >= cutoff):
+            continue
+        try:
+            delete_stored_collection(
+                config.VECTOR_BACKEND, name, get_chroma_client, persist_dir
+            )
+            deleted.append(name)
+        except Exception as e:
+            logging.error(f"Failed to delete collection {name}: {str(e)}")
+    if deleted:
+        logging.info(
+            f"Retention: deleted {len(deleted)} of {len(stored)} stored collections"
+        )
+    return deleted
+
+
+def _schedule_retention_sweep():
+    """Run ``prune_stored_collections`` in the background, at most once an interval."""
+    global _last_retention_sweep
+    with _retention_lock:
+        now = time.monotonic()
+        if (
+            _last_retention_sweep is not None
+            and now - _last_retention_sweep < RETENTION_SWEEP_INTERVAL_SECONDS
+        ):
+            return
+        _last_retention_sweep = now
+
+    def sweep():
+        try:
+            prune_stored_collections()
+        except Exception as e:
+            logging.error(f"Collection retention sweep failed: {str(e)}")
+
+    threading.Thread(target=sweep, name="index-retention", daemon=True).start()
+
+
+def candidate_collection_name(candidate_id: str) -> str:
+    """Per-candidate collection; the settings hash keeps old chunking schemes apart."""
+    return f"candidate-{candidate_id[:32]}-{settings_fingerprint()[:8]}"
+
+
+def start_indexing(
+    pdf_paths: List[str],
+    candidate_id: Optional[str] = None,
+    job_description: Optional[str] = None,
+) -> Optional[VectorDB]:
+    """Kick off ingestion for these PDFs (if not already indexed) without waiting.
+
+    With a ``candidate_id`` the documents go into that candidate's persistent
+    collection, which is synced to exactly ``pdf_paths`` (plus the job
+    description): unchanged documents are kept and only added or swapped ones
+    are (re)indexed. The ID must outlive the session (the app uses the
+    resume's digest), or the collection is never reused; sessions sharing an
+    ID share the index, and the latest sync wins. Without one, the collection
+    is addressed by the document contents, so any session with the same
+    documents reuses it. Either way, stored collections are pruned per
+    INDEX_RETENTION_*.
+
+    The returned VectorDB is the readiness handle: call
+    ``wait_until_queryable(timeout)`` on it before using it for retrieval.
+    """
+    if not pdf_paths and not (job_description and job_description.strip()):
+        return None
+
+    _schedule_retention_sweep()
+    if candidate_id:
+        key = candidate_collection_name(candidate_id)
+        vector_db = index_cache.get_or_create(
+            key,
+            lambda: VectorDB(
+                pdf_paths, collection_name=key, job_description=job_description
+            ),
+        )
+        vector_db.sync_documents(pdf_paths, job_description)
+    else:
+        key = document_fingerprint(pdf_paths, job_description)
+        vector_db = index_cache.get_or_create(
+            key, lambda: VectorDB(pdf_paths, job_description=job_description)
+        )
+
+    # Don't keep failed builds around; the next rerun should retry
+    if not vector_db.is_available:
+        index_cache.pop(key)
+    else:
+        vector_db.touch()
+
+    logging.info(f"Index cache stats: {index_cache.stats()}")
+    return vector_db
+
+
+def get_vector_db(
+    pdf_paths: List[str],
+    timeout: Optional[float] = None,
+    candidate_id: Optional[str] = None,
+    job_description: Optional[str] = None,
+) -> Optional[VectorDB]:
+    """Return a queryable VectorDB for these PDFs, ingesting them only on a cache miss.
+
+    Returns as soon as the first chunks are searchable; the rest of the
+    documents keep streaming in on the background thread.
+    """
+    vector_db = start_indexing(pdf_paths, candidate_id, job_description)
+    if vector_db is not None:
+        vector_db.wait_until_queryable(timeout)
+    return vector_db
+
+
+_shared_indexes = {}
+_shared_indexes_lock = threading.Lock()
+
+
+def open_shared_index(path: str) -> Optional[VectorDB]:
+    """Open a prebuilt shared index (see utils/shared_index.py) read-only.
+
+    The files are memory-mapped, so every worker process that opens the same
+    index shares one copy through the OS page cache; each process opens it
+    once. Search it like any other VectorDB (vector retrieval only).
+    """
+    path = os.path.abspath(path)
+    with _shared_indexes_lock:
+        if path not in _shared_indexes:
+            try:
+                backend = MappedBackend(path)
+            except Exception as e:
+                logging.error(f"Failed to open shared index {path}: {str(e)}")
+                return None
+            _shared_indexes[path] = VectorDB(
+                [], collection_name=f"shared-{backend.collection_name}", backend=backend
+            )
+        return _shared_indexes[path]
+
+
+def exclude_chunks(context: dict, included_text: str) -> dict:
+    """Drop the chunks of ``context`` whose text is already in ``included_text``."""
+    return {
+        namespace: [doc for doc in docs if doc.page_content not in included_text]
+        for namespace, docs in context.items()
+    }
+
+
+def merge_contexts(*contexts: dict) -> dict:
+    """Merge {namespace: [Document, ...]} dicts in order, dropping repeated chunks."""
+    merged = {}
+    for context in contexts:
+        for namespace, docs in context.items():
+            merged_docs = merged.setdefault(namespace, [])
+            seen = {doc.metadata.get("chunk_id") for doc in merged_docs}
+            for doc in docs:
+                if doc.metadata.get("chunk_id") not in seen:
+                    seen.add(doc.metadata.get("chunk_id"))
+                    merged_docs.append(doc)
+    return merged
+
+
+def reference_block(context_text: str, job_description_text: str = "") -> str:
+    """The system prompt's reference section; empty parts get no heading."""
+    sections = []
+    if context_text.strip():
+        sections.append(
+            f"Context information from the candidate's documents:\n{context_text}"
+        )
+    if job_description_text.strip():
+        sections.append(
+            "Relevant requirements from the job description:\n"
+            f"{job_description_text}"
+        )
+    if not sections:
+        return ""
+    return "\n\n".join(sections) + ("""
+
+Leverage the context and details provided to structure your questions and responses.
+Focus on extracting the candidate's skills, experiences, and achievements that best demonstrate their capabilities.
+Conduct this session as a professional, respectful job interview—maintaining an unbiased tone while adapting your 
+questions based on the candidate's background and responses Remain in character as a seasoned interviewer throughout the session.
+""")
 
 
 class ConversationalRetrievalChain:
@@ -76,59 +1039,265 @@ class ConversationalRetrievalChain:
         self.model_name = model_name
         self.temperature = temperature
 
-    def create_chain(self, vector_db: VectorDB):
-        self.model = ChatOpenAI(
-            model_name=self.model_name,
-            temperature=self.temperature,
+    def create_chain(self, vector_db: VectorDB, k_per_namespace: dict = None):
+        if k_per_namespace is None:
+            k_per_namespace = {
+                DOCUMENTS_NAMESPACE: config.RETRIEVAL_K_DOCUMENTS,
+                JOB_DESCRIPTION_NAMESPACE: config.RETRIEVAL_K_JOB_DESCRIPTION,
+            }
+
+        # Search each namespace separately so the job description can't crowd
+        # the resume out of the top-k (or vice versa)
+        self.vector_db = vector_db
+        self.k_per_namespace = {
+            namespace: k for namespace, k in k_per_namespace.items() if k > 0
+        }
+
+        return self
+
+    def retrieve(self, user_query: str, max_k: Optional[int] = None) -> dict:
+        """Return {namespace: [Document, ...]} for the query (embedded once)."""
+        return self.vector_db.search_namespaces(
+            user_query,
+            {
+                namespace: k if max_k is None else min(k, max_k)
+                for namespace, k in self.k_per_namespace.items()
+            },
         )
 
-        self.retriever = vector_db.vector_store.as_retriever(
-            search_type="similarity",
-            search_kwargs={"k": 3},
+    def retrieve_adaptive(self, user_query: str, retrieval_state: dict) -> dict:
+        """Like ``retrieve``, but skips, shrinks or reuses retrieval for low-information turns.
+
+        ``retrieval_state`` is owned by the caller (one per interview) and
+        remembers the last retrieved context and its query terms.
+        """
+        full_k = max(self.k_per_namespace.values(), default=0)
+        decision = decide_retrieval(
+            user_query,
+            previous=retrieval_state,
+            # A read-only index has no BM25 vocabulary to check terms against
+            vocabulary=(
+                None
+                if self.vector_db.read_only
+                else self.vector_db.lexical.vocabulary()
+            ),
+            max_k=full_k,
+        )
+        k = decision["k"]
+        chunks_saved = sum(
+            n - (min(n, k) if decision["action"] == "retrieve" else 0)
+            for n in self.k_per_namespace.values()
+        )
+        record_decision(decision, chunks_saved)
+        logging.info(
+            f"Retrieval decision: {decision['action']} (k={k}, {decision['reason']})"
         )
 
-        return self
+        if decision["action"] == "reuse":
+            return retrieval_state["context"]
+        if decision["action"] == "skip":
+            return {}
+        docs_by_namespace = self.retrieve(user_query, max_k=k)
+        retrieval_state["terms"] = sorted(set(tokenize(user_query)))
+        retrieval_state["context"] = docs_by_namespace
+        return docs_by_namespace
+
+    def build_messages(self, query_dict) -> list:
+        """Retrieve context for the query and return the messages to send.
 
-    def __call__(self, query_dict):
+        Reference material that is the same on every turn (all stages'
+        context packs, as much as fits the budget) goes into the system
+        prompt, where the provider can cache it; chunks for this particular
+        turn that the reference doesn't already hold go into the turn notes
+        at the end.
+        """
         user_query = query_dict["query"]
 
-        # Search for relevant documents
-        docs = self.retriever.get_relevant_documents(user_query)
+        # Format the reference: merged, de-duplicated and within budget
+        reference_docs = self.vector_db.reference_context()
+        context_text, context_stats = assemble_context(
+            reference_docs.get(DOCUMENTS_NAMESPACE, []),
+            config.CONTEXT_TOKEN_BUDGET,
+        )
+        job_description_text, job_description_stats = assemble_context(
+            reference_docs.get(JOB_DESCRIPTION_NAMESPACE, []),
+            config.JOB_DESCRIPTION_TOKEN_BUDGET,
+        )
 
-        # Format the retrieved context
-        context_text = "\n\n".join([doc.page_content for doc in docs])
+        interview_stage = query_dict.get("interview_stage") or {}
+        stage_docs = self.vector_db.stage_context(interview_stage.get("current"))
+        retrieval_state = query_dict.get("retrieval_state")
+        if stage_docs is not None and interview_stage.get("questions_asked") == 0:
+            # First question of a stage: its precomputed pack is the context,
+            # so the turn costs no retrieval at all
+            turn_docs = stage_docs
+        elif config.ADAPTIVE_RETRIEVAL and retrieval_state is not None:
+            turn_docs = self.retrieve_adaptive(user_query, retrieval_state)
+        else:
+            turn_docs = self.retrieve(user_query)
+        # Only what the budgeted reference left out
+        turn_docs = exclude_chunks(
+            turn_docs, context_text + "\n\n" + job_description_text
+        )
 
-        # Format the complete prompt with context
-        formatted_prompt = f"""
-Context information from the candidate's documents:
-{context_text}
+        turn_context_text, turn_context_stats = assemble_context(
+            turn_docs.get(DOCUMENTS_NAMESPACE, [])
+            + turn_docs.get(JOB_DESCRIPTION_NAMESPACE, []),
+            config.TURN_CONTEXT_TOKEN_BUDGET,
+        )
+        logging.info(
+            f"Context tokens: documents {context_stats}, "
+            f"job description {job_description_stats}, "
+            f"this turn {turn_context_stats}; totals {assembly_stats()}"
+        )
 
-Leverage the context and details provided to structure your questions and responses.
-Focus on extracting the candidate's skills, experiences, and achievements that best demonstrate their capabilities.
-Conduct this session as a professional, respectful job interview—maintaining an unbiased tone while adapting your 
-questions based on the candidate's background and responses Remain in character as a seasoned interviewer throughout the session.
-"""
+        reference = reference_block(context_text, job_description_text)
+        turn_notes = query_dict.get("turn_notes", "")
+        if turn_context_text.strip():
+            turn_notes += (
+                "\n\nMore context relevant to the candidate's latest message:\n"
+                + turn_context_text
+            )
 
-        # Add formatted_prompt to user_query if not empty
-        if context_text.strip():
-            full_query = {
+        final_messages = assemble_messages(
+            query_dict.get("instructions", ""),
+            reference,
+            query_dict.get("history", []),
+            user_query,
+            turn_notes,
+        )
+        record_prompt_tokens(final_messages, query_dict.get("memory"))
+        return final_messages
+
+
+# One chain per index, reused across turns (and dropped with the index)
+_chains = weakref.WeakKeyDictionary()
+_chains_lock = threading.Lock()
+
+
+def get_chain(vector_db: VectorDB) -> ConversationalRetrievalChain:
+    with _chains_lock:
+        chain = _chains.get(vector_db)
+        if chain is None:
+            chain = ConversationalRetrievalChain().create_chain(vector_db)
+            _chains[vector_db] = chain
+        return chain
+
+
+def summarize_conversation(
+    previous_summary: str, messages: List[dict], max_tokens: int
+) -> str:
+    """Fold interview messages into the running summary (for ConversationMemory)."""
+    transcript = "\n".join(
+        f"{'Interviewer' if m['role'] == 'assistant' else 'Candidate'}: {m['content']}"
+        for m in messages
+    )
+    model = get_chat_model(config.SUMMARY_MODEL, temperature=0)
+    completion = model.invoke(
+        [
+            {
+                "role": "system",
+                "content": (
+                    "You keep concise notes on a job interview for the interviewer. "
+                    "Update the notes with the new exchanges. Keep the candidate's "
+                    "concrete claims (skills, projects, employers, numbers), the "
+                    "topics already covered and any open follow-ups. "
+                    f"Use at most {int(max_tokens * 0.75)} words."
+                ),
+            },
+            {
                 "role": "user",
-                "content": formatted_prompt + "\n\nUser message: " + user_query,
-            }
-        else:
-            full_query = {"role": "user", "content": user_query}
+                "content": f"Current notes:\n{previous_summary or '(none)'}\n\n"
+                f"New exchanges:\n{transcript}",
+            },
+        ]
+    )
+    return completion.content
+
 
-        # Get messages including the system message
-        # (which should be at messages[0]["content"] passed by the conduct_interview function)
-        messages = query_dict.get("messages", [])
+def create_conversation_memory() -> ConversationMemory:
+    """Memory for one interview, sized from the config."""
+    return ConversationMemory(
+        summarize_conversation,
+        recent_turns=config.MEMORY_RECENT_TURNS,
+        token_budget=config.HISTORY_TOKEN_BUDGET,
+        summary_token_budget=config.SUMMARY_TOKEN_BUDGET,
+    )
 
-        completion = self.model.invoke(messages + [full_query])
 
-        return {"result": completion.content}
+def record_prompt_tokens(messages: List[dict], memory=None) -> int:
+    tokens = message_tokens(messages)
+    if memory is not None:
+        memory.record_prompt(tokens)
+    logging.info(f"Prompt tokens this turn: {tokens}")
+    return tokens
 
 
-def conduct_interview(messages, vector_db: VectorDB, interview_stage=None):
-    """Main function to execute the interview with context and retrieval."""
+def conduct_interview(
+    messages,
+    vector_db: VectorDB,
+    interview_stage=None,
+    retrieval_state=None,
+    memory: Optional[ConversationMemory] = None,
+):
+    """Main function to execute the interview with context and retrieval.
+
+    Pass the same ``retrieval_state`` dict on every turn of an interview to
+    let low-information turns skip retrieval or reuse the previous context,
+    and the same ``memory`` to bound the history sent with each turn.
+    """
+    return "".join(
+        stream_interview(
+            messages, vector_db, interview_stage, retrieval_state, memory=memory
+        )
+    )
+
+
+def stream_interview(
+    messages,
+    vector_db: VectorDB,
+    interview_stage=None,
+    retrieval_state=None,
+    metrics: Optional[dict] = None,
+    memory: Optional[ConversationMemory] = None,
+):
+    """Like ``conduct_interview``, but yields the reply as it is generated.
+
+    If given, ``metrics`` is filled in with ``ttft_seconds`` (from the call
+    to the first token, retrieval included), ``total_seconds`` and the
+    completion's token usage (``prompt_tokens``, ``cached_tokens``, ...).
+    """
+    metrics = {} if metrics is None else metrics
+    start = time.perf_counter()
+    try:
+        with connection_usage() as usage:
+            for piece in _interview_reply(
+                messages, vector_db, interview_stage, retrieval_state, memory, metrics
+            ):
+                if "ttft_seconds" not in metrics:
+                    metrics["ttft_seconds"] = time.perf_counter() - start
+                yield piece
+    finally:
+        metrics["total_seconds"] = time.perf_counter() - start
+        if "ttft_seconds" in metrics:
+            generation_timings["turns"] += 1
+            generation_timings["ttft_seconds"] += metrics["ttft_seconds"]
+            generation_timings["total_seconds"] += metrics["total_seconds"]
+        logging.info(
+            f"Turn latency: {metrics}; averages {generation_stats()}; "
+            f"prompt cache {prompt_cache_stats()}; "
+            f"connections: {usage}; process totals: {tracer.stats()}"
+        )
+
+
+def _interview_inputs(messages, interview_stage, memory=None):
+    """Return (instructions, history, latest query, turn notes) for a turn.
+
+    The instructions never change, so they can open a cached prompt prefix;
+    the interview stage, which does, goes into the turn notes. The history
+    leaves out the latest message (it is sent once, as the query). With a
+    ``memory`` the history is its bounded view: summary plus recent turns.
+    """
     # Define the system message to guide the LLM
     system_prompt = (
         "You are conducting a professional job interview. Remain strictly in the role of the interviewer. Your responsibilities include:\n"
@@ -143,62 +1312,100 @@ def conduct_interview(messages, vector_db: VectorDB, interview_stage=None):
     )
 
     # Add interview stage context if available
+    turn_notes = ""
     if interview_stage:
         current_stage = interview_stage.get("current", "introduction")
         questions_asked = interview_stage.get("questions_asked", 0)
 
-        stage_guidance = {
-            "introduction": "Establish rapport and gather general background, inviting the candidate to share their journey and inspiration in their field.",
-            "technical": "Focus on core skills and projects by exploring specific technical challenges and problem-solving approaches relevant to their expertise.",
-            "behavioral": "Investigate softskill and interpersonal experiences by examining how the candidate handled teamwork, conflict, and leadership situations.",
-            "experience": "Explore details from the candidate's resume and cover letter, highlighting key achievements and the strategies behind them.",
-            "closing": "Summarize the discussion and invite reflection on future goals, ensuring an opportunity for the candidate to share any final thoughts.",
-        }
-
-        system_prompt += f"\n\nCurrent interview stage: {current_stage}. {stage_guidance.get(current_stage, '')} You have asked {questions_asked} questions so far in this stage."
-
-    # Create the system message
-    system_message = [
-        {
-            "role": "system",
-            "content": system_prompt,
-        }
-    ]
+        turn_notes = f"Current interview stage: {current_stage}. {STAGE_GUIDANCE.get(current_stage, '')} You have asked {questions_asked} questions so far in this stage."
 
     # Get just the user and assistant messages for context
     user_messages = []
     for msg in messages:
         if msg["role"] in ["user", "assistant"]:
             user_messages.append(msg)
+    if user_messages and user_messages[-1] is messages[-1]:
+        user_messages = user_messages[:-1]
+    if memory is not None:
+        user_messages = memory.context_messages(user_messages)
 
     # Get the last user message to use as the query
     query = messages[-1]["content"].strip()
+    return system_prompt, user_messages, query, turn_notes
+
 
-    # Initialize the conversational retrieval chain
-    if (
+def _can_retrieve(vector_db) -> bool:
+    return (
         vector_db is not None
         and hasattr(vector_db, "is_available")
         and vector_db.is_available
-        and vector_db.vector_store is not None
-    ):
-        # If we have documents to query and VectorDB is available
+        and vector_db.is_queryable
+    )
+
+
+def build_interview_messages(
+    messages,
+    vector_db: VectorDB,
+    interview_stage=None,
+    retrieval_state=None,
+    memory: Optional[ConversationMemory] = None,
+) -> list:
+    """The chat messages for the next interviewer reply, retrieved context included.
+
+    Falls back to the plain conversation if retrieval isn't possible.
+    """
+    instructions, history, query, turn_notes = _interview_inputs(
+        messages, interview_stage, memory
+    )
+    if _can_retrieve(vector_db):
         try:
-            qa_chain = ConversationalRetrievalChain().create_chain(vector_db)
-            # Pass both the system message and context messages to the chain
-            result = qa_chain(
-                {"query": query, "messages": system_message + user_messages}
+            final_messages = get_chain(vector_db).build_messages(
+                {
+                    "query": query,
+                    "instructions": instructions,
+                    "history": history,
+                    "turn_notes": turn_notes,
+                    "retrieval_state": retrieval_state,
+                    "interview_stage": interview_stage,
+                    "memory": memory,
+                }
             )
-            return result["result"]
+            logging.info(f"Retrieval stats: {retrieval_stats()}")
+            logging.info(f"Retrieval policy stats: {policy_stats()}")
+            return final_messages
         except Exception as e:
             logging.error(f"Error using VectorDB for retrieval: {str(e)}")
             print(f"Falling back to standard chat mode due to error: {str(e)}")
-            # Fall back to direct ChatOpenAI call
+    final_messages = assemble_messages(instructions, "", history, query, turn_notes)
+    record_prompt_tokens(final_messages, memory)
+    return final_messages
+
 
-    # If no documents were provided or VectorDB failed, use a direct call to ChatOpenAI
-    model = ChatOpenAI(model_name="gpt-4o", temperature=0)
-    # Add the user query as the last message
-    final_messages = (
-        system_message + user_messages + [{"role": "user", "content": query}]
+def _interview_reply(
+    messages, vector_db, interview_stage, retrieval_state, memory=None, metrics=None
+):
+    final_messages = build_interview_messages(
+        messages, vector_db, interview_stage, retrieval_state, memory
     )
-    completion = model.invoke(final_messages)
-    return completion.content
+    if not _can_retrieve(vector_db):
+        yield from stream_chat(final_messages, "gpt-4o", 0, metrics)
+        return
+
+    streamed = False
+    try:
+        for piece in stream_chat(final_messages, "gpt-4o", 0, metrics):
+            streamed = True
+            yield piece
+        return
+    except Exception as e:
+        logging.error(f"Error generating a reply with retrieved context: {str(e)}")
+        if streamed:
+            # Part of the reply is already on screen; don't start over
+            return
+        print(f"Falling back to standard chat mode due to error: {str(e)}")
+
+    # Fall back to a plain chat completion without the retrieved context
+    final_messages = build_interview_messages(
+        messages, None, interview_stage, retrieval_state, memory
+    )
+    yield from stream_chat(final_messages, "gpt-4o", 0, metrics)
@@ -1,15 +1,19 @@
 import base64
 import streamlit as st
+import streamlit.components.v1 as components
 import os
 import openai
-from openai import OpenAI
 from dotenv import load_dotenv
 import time
+import config
+from utils.client_pool import get_openai_client
+from utils.tts_pipeline import clip_html
 
 load_dotenv()
 api_key = os.getenv("OPENAI_API_KEY")
 
-client = OpenAI(api_key=api_key)
+# Shares keep-alive connections with the interviewer's chat calls
+client = get_openai_client()
 openai.api_key = api_key
 
 
@@ -62,6 +66,19 @@ def text_to_speech(input_text):
         return fallback_path
 
 
+def synthesize_speech(input_text) -> bytes:
+    """Return MP3 audio for a short piece of text (one sentence of a reply)."""
+    response = client.audio.speech.create(
+        model=config.TTS_MODEL, voice=config.TTS_VOICE, input=input_text[:4000]
+    )
+    return response.content
+
+
+def queue_audio_clip(turn_id: str, index: int, audio: bytes):
+    """Queue a clip for gapless playback after the turn's earlier clips."""
+    components.html(clip_html(turn_id, index, audio), height=0)
+
+
 def autoplay_audio(file_path: str):
     try:
         if not os.path.exists(file_path):
@@ -0,0 +1,371 @@
+"""Asynchronous interview turn engine with per-stage timings.
+
+A turn runs as coroutines on one long-lived event loop (so the async HTTP
+connection pool survives from turn to turn):
+
+    stt        transcribe the candidate's answer (AsyncOpenAI, no temp file)
+    warmup     meanwhile, open a keep-alive connection for speech, unless the
+               previous turn's connections are still idle in the pool
+    retrieval  the moment the transcript arrives: wait for the index, embed,
+               search and assemble the prompt (blocking work, on a thread)
+    llm        stream the interviewer's reply
+    tts        synthesize each finished sentence while the reply is still
+               generating (up to TTS_WORKERS at once), delivered in order
+
+``run_turn`` is the coroutine; ``iter_turn`` drives it from synchronous code
+(Streamlit) and yields its events as they happen. Run it headlessly with:
+
+    python turn_engine.py --text "I led the Kubernetes migration" --resume cv.pdf
+    python turn_engine.py --audio answer.wav --resume cv.pdf --save-audio out/
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from typing import Callable, Iterator, List, Optional
+
+import config
+from generate_answer import build_interview_messages, get_vector_db
+from helpers import synthesize_speech
+from utils.client_pool import get_async_openai_client, get_openai_client, tracer
+from utils.prompt_assembly import record_usage
+from utils.tts_pipeline import SpeechPipeline
+
+# Stage durations summed over turns (ms), for stage_stats()
+stage_totals = Counter()
+
+_loop = None
+_loop_lock = threading.Lock()
+# When the last turn's speech requests finished (monotonic seconds)
+_last_speech_at = None
+
+
+class StageTimer:
+    """Start and end of each stage, and named points, in ms from turn start."""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.stages = {}
+        self.marks = {}
+
+    def _now_ms(self) -> float:
+        return round((time.perf_counter() - self._start) * 1000, 1)
+
+    def begin(self, stage: str):
+        self.stages[stage] = [self._now_ms(), None]
+
+    def end(self, stage: str):
+        self.stages[stage][1] = self._now_ms()
+
+    def mark(self, name: str):
+        self.marks.setdefault(name, self._now_ms())
+
+    def summary(self) -> dict:
+        return {
+            "stages": {name: tuple(span) for name, span in self.stages.items()},
+            "marks": dict(self.marks),
+            "total_ms": self._now_ms(),
+        }
+
+
+def stage_stats() -> dict:
+    """Average duration per stage (ms) over the turns run so far."""
+    turns = stage_totals["turns"]
+    if not turns:
+        return {"turns": 0}
+    return {
+        "turns": turns,
+        **{
+            f"avg_{name}": round(total / turns, 1)
+            for name, total in stage_totals.items()
+            if name != "turns"
+        },
+    }
+
+
+def _needs_warmup() -> bool:
+    """True unless the last turn's speech connections are still in the keep-alive pool."""
+    return (
+        _last_speech_at is None
+        or time.monotonic() - _last_speech_at >= config.HTTP_KEEPALIVE_SECONDS
+    )
+
+
+async def _warm_connection(timer: StageTimer):
+    """Open a keep-alive connection now, so the first speech request doesn't pay for it."""
+    timer.begin("warmup")
+    try:
+        await asyncio.to_thread(get_openai_client().models.retrieve, config.TTS_MODEL)
+    except Exception as e:
+        logging.warning(f"Connection warm-up failed: {str(e)}")
+    timer.end("warmup")
+
+
+async def run_turn(
+    messages: List[dict],
+    vector_db=None,
+    audio: Optional[bytes] = None,
+    audio_name: str = "answer.mp3",
+    interview_stage: Optional[dict] = None,
+    retrieval_state: Optional[dict] = None,
+    memory=None,
+    reply: bool = True,
+    speak: bool = True,
+    model: str = "gpt-4o",
+    emit: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """Run one turn and return its transcript, reply, timings and token usage.
+
+    ``messages`` is the conversation so far (not modified). With ``audio``
+    the candidate's answer is transcribed first; without it the last
+    message is the answer. ``emit`` receives "transcript", "token" and
+    "clip" events as they happen.
+    """
+    global _last_speech_at
+    emit = emit or (lambda event: None)
+    client = get_async_openai_client()
+    timer = StageTimer()
+    requests_before = tracer.stats()["requests"]
+    warmup = (
+        asyncio.create_task(_warm_connection(timer))
+        if reply and speak and _needs_warmup()
+        else None
+    )
+    messages = list(messages)
+    transcript = None
+
+    try:
+        if audio is not None:
+            timer.begin("stt")
+            transcript = await client.audio.transcriptions.create(
+                model="whisper-1", response_format="text", file=(audio_name, audio)
+            )
+            transcript = transcript.strip()
+            timer.end("stt")
+            emit({"type": "transcript", "text": transcript})
+            if not transcript:
+                reply = False
+            else:
+                messages.append({"role": "user", "content": transcript})
+
+        response_text = ""
+        clip_count = 0
+        usage = {}
+        if reply:
+            timer.begin("retrieval")
+            prompt = await asyncio.to_thread(
+                _prepare_prompt,
+                messages,
+                vector_db,
+                interview_stage,
+                retrieval_state,
+                memory,
+            )
+            timer.end("retrieval")
+
+            # Sentences are synthesized on the pipeline's threads, clips
+            # handed out in sentence order
+            speech = (
+                SpeechPipeline(synthesize_speech, config.TTS_WORKERS) if speak else None
+            )
+
+            def deliver(clips):
+                nonlocal clip_count
+                for clip in clips:
+                    timer.mark("first_clip")
+                    emit(
+                        {"type": "clip", "index": clip["index"], "audio": clip["audio"]}
+                    )
+                    clip_count += 1
+
+            def queue_speech(text):
+                speech.feed(text)
+                if speech.stats()["sentences"] and "tts" not in timer.stages:
+                    timer.begin("tts")
+                deliver(speech.ready_clips())
+
+            pieces = []
+            try:
+                timer.begin("llm")
+                stream = await client.chat.completions.create(
+                    model=model,
+                    messages=prompt,
+                    temperature=0,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+                async with stream:
+                    async for chunk in stream:
+                        if chunk.usage:
+                            record_usage(chunk.usage, usage)
+                        text = chunk.choices[0].delta.content if chunk.choices else None
+                        if not text:
+                            continue
+                        timer.mark("first_token")
+                        pieces.append(text)
+                        emit({"type": "token", "text": text})
+                        if speech is not None:
+                            queue_speech(text)
+                timer.end("llm")
+                if speech is not None:
+                    speech.close()
+                    if "tts" not in timer.stages and speech.stats()["sentences"]:
+                        timer.begin("tts")
+                    remaining = speech.remaining_clips()
+                    while (
+                        clip := await asyncio.to_thread(next, remaining, None)
+                    ) is not None:
+                        deliver([clip])
+                    _last_speech_at = time.monotonic()
+            finally:
+                # On error or cancellation (nobody is reading any more), drop
+                # the speech still queued
+                if speech is not None:
+                    speech.cancel()
+            if "tts" in timer.stages:
+                timer.end("tts")
+            response_text = "".join(pieces)
+    finally:
+        if warmup is not None:
+            await warmup
+
+    timings = timer.summary()
+    for name, (start, end) in timings["stages"].items():
+        if end is not None:
+            stage_totals[f"{name}_ms"] += end - start
+    for name, offset in timings["marks"].items():
+        stage_totals[f"{name}_at_ms"] += offset
+    stage_totals["total_ms"] += timings["total_ms"]
+    stage_totals["turns"] += 1
+    logging.info(
+        f"Turn stages: {timings}; requests: "
+        f"{tracer.stats()['requests'] - requests_before}; averages {stage_stats()}"
+    )
+    return {
+        "transcript": transcript,
+        "reply": response_text,
+        "clips": clip_count,
+        "timings": timings,
+        "usage": usage,
+    }
+
+
+def _prepare_prompt(messages, vector_db, interview_stage, retrieval_state, memory):
+    if vector_db is not None:
+        # Don't hold the turn hostage to a slow ingestion
+        vector_db.wait_until_queryable(config.INDEX_READY_TIMEOUT_SECONDS)
+    return build_interview_messages(
+        messages, vector_db, interview_stage, retrieval_state, memory
+    )
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """The engine's event loop, running on a daemon thread for the process lifetime."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="turn-engine", daemon=True
+            ).start()
+        return _loop
+
+
+def iter_turn(**kwargs) -> Iterator[dict]:
+    """Run a turn on the engine loop, yielding its events in the calling thread.
+
+    Takes ``run_turn``'s arguments (except ``emit``). Yields "transcript",
+    "token" and "clip" events, then a "done" event carrying ``run_turn``'s
+    result; errors are raised here. Closing the generator early (e.g. a
+    Streamlit rerun abandoning it) cancels the turn, so it stops generating
+    and synthesizing speech nobody will receive.
+    """
+    events = queue.Queue()
+    future = asyncio.run_coroutine_threadsafe(
+        run_turn(emit=events.put, **kwargs), _get_loop()
+    )
+    future.add_done_callback(lambda _: events.put(None))
+    try:
+        while (event := events.get()) is not None:
+            yield event
+        yield {"type": "done", **future.result()}
+    finally:
+        if not future.done():
+            future.cancel()
+
+
+def format_timings(timings: dict) -> str:
+    lines = [f"{'stage':<12} {'start (ms)':>11} {'end (ms)':>9} {'took (ms)':>10}"]
+    for name, (start, end) in timings["stages"].items():
+        took = f"{end - start:>10.1f}" if end is not None else f"{'-':>10}"
+        lines.append(f"{name:<12} {start:>11.1f} {end or 0:>9.1f} {took}")
+    for name, offset in timings["marks"].items():
+        lines.append(f"{name:<12} {offset:>11.1f}")
+    lines.append(f"{'total':<12} {timings['total_ms']:>21.1f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run one interview turn headlessly and print per-stage timings."
+    )
+    answer = parser.add_mutually_exclusive_group(required=True)
+    answer.add_argument("--audio", help="recorded answer to transcribe")
+    answer.add_argument("--text", help="the candidate's answer as text")
+    parser.add_argument("--resume", nargs="*", default=[], help="PDFs to index")
+    parser.add_argument("--job-description")
+    parser.add_argument("--stage", default="introduction")
+    parser.add_argument("--question", default="Tell me about yourself.")
+    parser.add_argument("--no-speech", action="store_true")
+    parser.add_argument("--save-audio", help="directory for the reply's clips")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    vector_db = None
+    if args.resume or args.job_description:
+        vector_db = get_vector_db(
+            args.resume,
+            timeout=config.INDEX_READY_TIMEOUT_SECONDS,
+            job_description=args.job_description,
+        )
+    messages = [{"role": "assistant", "content": args.question}]
+    audio = None
+    if args.audio:
+        with open(args.audio, "rb") as f:
+            audio = f.read()
+    else:
+        messages.append({"role": "user", "content": args.text})
+    if args.save_audio:
+        os.makedirs(args.save_audio, exist_ok=True)
+
+    for event in iter_turn(
+        messages=messages,
+        vector_db=vector_db,
+        audio=audio,
+        audio_name=os.path.basename(args.audio or "answer.mp3"),
+        interview_stage={"current": args.stage, "questions_asked": 1},
+        retrieval_state={},
+        speak=not args.no_speech,
+    ):
+        if event["type"] == "transcript":
+            print(f"Candidate: {event['text']}\nInterviewer: ", end="", flush=True)
+        elif event["type"] == "token":
+            print(event["text"], end="", flush=True)
+        elif event["type"] == "clip" and args.save_audio:
+            clip_path = os.path.join(args.save_audio, f"clip-{event['index']:02d}.mp3")
+            with open(clip_path, "wb") as f:
+                f.write(event["audio"])
+        elif event["type"] == "done":
+            print(f"\n\n{event['clips']} speech clips\n")
+            print(format_timings(event["timings"]))
+            if event["usage"]:
+                print(f"\nTokens: {event['usage']}")
+
+
+if __name__ == "__main__":
+    main()
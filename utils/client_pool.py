@@ -0,0 +1,166 @@
+import logging
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+import httpx
+from langchain_community.chat_models import ChatOpenAI
+from openai import AsyncOpenAI, OpenAI
+
+import config
+
+_lock = threading.Lock()
+_http_client = None
+_openai_client = None
+_async_openai_client = None
+_chat_models = {}
+
+
+class ConnectionTracer:
+    """Counts requests, new TCP connections and TLS handshakes via httpcore traces.
+
+    Totals are kept for the process and per thread, so a caller can measure
+    what one turn (which runs on one script thread) cost.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.totals = Counter()
+
+    def _thread_counts(self) -> Counter:
+        counts = getattr(self._local, "counts", None)
+        if counts is None:
+            counts = self._local.counts = Counter()
+        return counts
+
+    def __call__(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            key = "new_connections"
+        elif event_name == "connection.start_tls.complete":
+            key = "tls_handshakes"
+        elif event_name.endswith(".send_request_headers.started"):
+            key = "requests"
+        else:
+            return
+        self._thread_counts()[key] += 1
+        with self._lock:
+            self.totals[key] += 1
+
+    async def atrace(self, event_name: str, info: dict):
+        """Same as calling the tracer; httpcore needs a coroutine for async clients."""
+        self(event_name, info)
+
+    def snapshot(self) -> Counter:
+        return Counter(self._thread_counts())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return usage_summary(self.totals)
+
+
+def usage_summary(counts: Counter) -> dict:
+    requests = counts.get("requests", 0)
+    new_connections = counts.get("new_connections", 0)
+    return {
+        "requests": requests,
+        "new_connections": new_connections,
+        "reused_connections": max(0, requests - new_connections),
+        "tls_handshakes": counts.get("tls_handshakes", 0),
+    }
+
+
+tracer = ConnectionTracer()
+
+
+def _attach_tracer(request: httpx.Request):
+    request.extensions["trace"] = tracer
+
+
+async def _attach_async_tracer(request: httpx.Request):
+    request.extensions["trace"] = tracer.atrace
+
+
+def _timeout_and_limits() -> dict:
+    return {
+        "timeout": httpx.Timeout(config.OPENAI_TIMEOUT_SECONDS, connect=10.0),
+        "limits": httpx.Limits(
+            max_connections=config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=config.HTTP_KEEPALIVE_SECONDS,
+        ),
+    }
+
+
+def get_http_client() -> httpx.Client:
+    """Process-wide HTTP client, so keep-alive connections and TLS sessions are reused."""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                **_timeout_and_limits(), event_hooks={"request": [_attach_tracer]}
+            )
+        return _http_client
+
+
+def get_openai_client() -> OpenAI:
+    """Shared OpenAI client on top of the pooled HTTP client."""
+    global _openai_client
+    http_client = get_http_client()
+    with _lock:
+        if _openai_client is None:
+            _openai_client = OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client
+            )
+        return _openai_client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Shared AsyncOpenAI client with its own pooled async HTTP client.
+
+    Async connections belong to the event loop that opened them, so use it
+    from one long-lived loop only (the turn engine's).
+    """
+    global _async_openai_client
+    with _lock:
+        if _async_openai_client is None:
+            _async_openai_client = AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                http_client=httpx.AsyncClient(
+                    **_timeout_and_limits(),
+                    event_hooks={"request": [_attach_async_tracer]},
+                ),
+            )
+        return _async_openai_client
+
+
+def get_chat_model(model_name: str = "gpt-4o", temperature: float = 0):
+    """Pooled ChatOpenAI per (model, temperature), all sharing one HTTP client."""
+    key = (model_name, temperature)
+    openai_client = get_openai_client()
+    with _lock:
+        model = _chat_models.get(key)
+        if model is None:
+            model = ChatOpenAI(
+                model_name=model_name,
+                temperature=temperature,
+                client=openai_client.chat.completions,
+            )
+            _chat_models[key] = model
+        return model
+
+
+@contextmanager
+def connection_usage():
+    """Measure the requests and new connections made on this thread in a block.
+
+    Yields a dict that is filled in when the block exits.
+    """
+    before = tracer.snapshot()
+    usage = {}
+    try:
+        yield usage
+    finally:
+        usage.update(usage_summary(tracer.snapshot() - before))
+        logging.debug(f"Connection usage: {usage}")
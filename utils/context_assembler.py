@@ -0,0 +1,171 @@
+import re
+import threading
+from collections import Counter
+from typing import List, Tuple
+
+from langchain_core.documents import Document
+
+from utils.token_counter import count_tokens, truncate_to_tokens
+
+# Chunks whose word shingles overlap at least this much are near-duplicates
+NEAR_DUPLICATE_JACCARD = 0.8
+# Shortest shared prefix/suffix treated as splitter overlap rather than chance
+MIN_OVERLAP_CHARS = 20
+# Don't bother adding a truncated chunk with less room than this
+MIN_TRUNCATED_TOKENS = 40
+# Chunks at most this far apart on the page are adjacent (the splitter strips
+# the whitespace between them)
+MAX_ADJACENT_GAP_CHARS = 4
+
+assembly_counts = Counter()
+_counts_lock = threading.Lock()
+
+
+def _overlap(a: str, b: str) -> int:
+    """Length of the longest suffix of ``a`` that is also a prefix of ``b``."""
+    for n in range(min(len(a), len(b)) - 1, MIN_OVERLAP_CHARS - 1, -1):
+        if a.endswith(b[:n]):
+            return n
+    return 0
+
+
+def _merge_pair(a: str, b: str):
+    """Merged text if ``a`` and ``b`` overlap or contain each other, else None."""
+    if b in a:
+        return a
+    if a in b:
+        return b
+    n = _overlap(a, b)
+    if n:
+        return a + b[n:]
+    n = _overlap(b, a)
+    if n:
+        return b + a[n:]
+    return None
+
+
+def _merge_spans(a: Document, b: Document):
+    """Merged chunk if ``a`` and ``b`` (both with a ``start_index``) overlap or touch."""
+    first, second = sorted((a, b), key=lambda doc: doc.metadata["start_index"])
+    first_start = first.metadata["start_index"]
+    first_end = first_start + len(first.page_content)
+    second_start = second.metadata["start_index"]
+    if second_start > first_end + MAX_ADJACENT_GAP_CHARS:
+        return None
+    if second_start >= first_end:
+        gap = "\n" if second_start > first_end else ""
+        text = first.page_content + gap + second.page_content
+    else:
+        text = first.page_content + second.page_content[first_end - second_start :]
+    return Document(
+        page_content=text, metadata={**a.metadata, "start_index": first_start}
+    )
+
+
+def _merge_same_page(a: Document, b: Document):
+    """Merged chunk if ``a`` and ``b`` are on the same page and join up, else None."""
+    if (a.metadata.get("source"), a.metadata.get("page")) != (
+        b.metadata.get("source"),
+        b.metadata.get("page"),
+    ):
+        return None
+    if None not in (a.metadata.get("start_index"), b.metadata.get("start_index")):
+        return _merge_spans(a, b)
+    text = _merge_pair(a.page_content, b.page_content)
+    if text is None:
+        return None
+    return Document(page_content=text, metadata=a.metadata)
+
+
+def merge_overlapping(docs: List[Document]) -> List[Document]:
+    """Merge chunks from the same page that overlap or are adjacent.
+
+    Chunks with a ``start_index`` merge when their spans overlap or touch;
+    others when their text overlaps (splitter overlap) or one contains the
+    other. Merging repeats until nothing changes, so a chunk that bridges
+    two others joins all three. A merged chunk takes the rank of its
+    best-ranked part.
+    """
+    merged: List[Document] = list(docs)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(merged)):
+            for j in range(i + 1, len(merged)):
+                combined = _merge_same_page(merged[i], merged[j])
+                if combined is not None:
+                    merged[i] = combined
+                    del merged[j]
+                    changed = True
+                    break
+            if changed:
+                break
+    return merged
+
+
+def _shingles(text: str, size: int = 3) -> set:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < size:
+        return {tuple(words)}
+    return {tuple(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def drop_near_duplicates(docs: List[Document]) -> List[Document]:
+    """Keep the best-ranked of any chunks with nearly the same wording."""
+    kept, kept_shingles = [], []
+    for doc in docs:
+        shingles = _shingles(doc.page_content)
+        if any(
+            len(shingles & other) / (len(shingles | other) or 1)
+            >= NEAR_DUPLICATE_JACCARD
+            for other in kept_shingles
+        ):
+            continue
+        kept.append(doc)
+        kept_shingles.append(shingles)
+    return kept
+
+
+def assemble_context(
+    docs: List[Document], token_budget: int, separator: str = "\n\n"
+) -> Tuple[str, dict]:
+    """Join ranked chunks into prompt context of at most ``token_budget`` tokens.
+
+    Overlapping chunks from the same page are merged, near-duplicates
+    dropped, and chunks added in rank order until the budget is reached (the
+    last one truncated if enough room is left). Returns the text and
+    {"chunks", "tokens_in", "tokens_out", "tokens_saved"}, where tokens_in is
+    what joining the chunks verbatim would have cost.
+    """
+    tokens_in = count_tokens(separator.join(doc.page_content for doc in docs))
+    parts, used = [], 0
+    separator_tokens = count_tokens(separator)
+    for doc in drop_near_duplicates(merge_overlapping(docs)):
+        cost = count_tokens(doc.page_content) + (separator_tokens if parts else 0)
+        if used + cost <= token_budget:
+            parts.append(doc.page_content)
+            used += cost
+            continue
+        room = token_budget - used - (separator_tokens if parts else 0)
+        if room >= MIN_TRUNCATED_TOKENS:
+            parts.append(truncate_to_tokens(doc.page_content, room))
+        break
+
+    text = separator.join(parts)
+    tokens_out = count_tokens(text) if parts else 0
+    stats = {
+        "chunks": len(parts),
+        "tokens_in": tokens_in,
+        "tokens_out": tokens_out,
+        "tokens_saved": max(0, tokens_in - tokens_out),
+    }
+    with _counts_lock:
+        assembly_counts["tokens_in"] += stats["tokens_in"]
+        assembly_counts["tokens_out"] += stats["tokens_out"]
+        assembly_counts["tokens_saved"] += stats["tokens_saved"]
+    return text, stats
+
+
+def assembly_stats() -> dict:
+    with _counts_lock:
+        return dict(assembly_counts)
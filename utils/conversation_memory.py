@@ -0,0 +1,142 @@
+"""Bounded conversation history: recent turns verbatim plus a rolling summary.
+
+Forwarding the whole transcript every turn makes each prompt grow with the
+interview (and the total cost grow quadratically). ``ConversationMemory``
+keeps the last ``recent_turns`` question/answer pairs word for word and
+folds everything older into a summary, updated on a background thread after
+each turn, so the history part of the prompt stays within a fixed budget.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+
+from utils.token_counter import count_tokens, truncate_to_tokens
+
+# Per-message overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def message_tokens(messages: List[dict]) -> int:
+    return sum(
+        count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
+
+
+class ConversationMemory:
+    """Per-interview memory; one instance per conversation.
+
+    ``summarize(previous_summary, messages, max_tokens)`` returns the new
+    summary covering both; it runs in the background, so a slow or failing
+    call never delays a turn (the older turns just stay verbatim, within
+    the budget, until it succeeds).
+    """
+
+    def __init__(
+        self,
+        summarize: Callable[[str, List[dict], int], str],
+        recent_turns: int = 4,
+        token_budget: int = 1500,
+        summary_token_budget: int = 300,
+    ):
+        self.summarize = summarize
+        self.recent_turns = recent_turns
+        self.token_budget = token_budget
+        self.summary_token_budget = summary_token_budget
+        self.summary = ""
+        self.summarized_count = 0  # leading messages folded into the summary
+        self.prompt_tokens = []  # total prompt tokens of each turn
+        self._lock = threading.Lock()
+        self._summarizing = False
+
+    def context_messages(self, history: List[dict]) -> List[dict]:
+        """The history to send: summary (if any) plus the most recent messages.
+
+        ``history`` is the full user/assistant transcript. Messages past the
+        summary are kept newest first until the budget runs out; the latest
+        message is always kept.
+        """
+        with self._lock:
+            summary, start = self.summary, self.summarized_count
+        messages = []
+        budget = self.token_budget
+        if summary:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": f"Summary of the interview so far:\n{summary}",
+                }
+            )
+            budget -= message_tokens(messages)
+        recent = []
+        for message in reversed(history[start:]):
+            cost = message_tokens([message])
+            if recent and cost > budget:
+                break
+            recent.append(message)
+            budget -= cost
+        dropped = len(history) - start - len(recent)
+        if dropped:
+            logging.info(
+                f"History budget: left out {dropped} older messages not yet summarized"
+            )
+        return messages + recent[::-1]
+
+    def record_prompt(self, tokens: int):
+        self.prompt_tokens.append(tokens)
+
+    def update(self, history: List[dict]):
+        """Fold messages older than the recent window into the summary, in the background."""
+        keep = 2 * self.recent_turns
+        with self._lock:
+            end = len(history) - keep
+            if self._summarizing or end <= self.summarized_count:
+                return
+            self._summarizing = True
+            to_fold = list(history[self.summarized_count : end])
+            previous = self.summary
+        threading.Thread(
+            target=self._summarize,
+            args=(previous, to_fold, end),
+            name="conversation-summary",
+            daemon=True,
+        ).start()
+
+    def _summarize(self, previous: str, to_fold: List[dict], end: int):
+        start = time.perf_counter()
+        try:
+            summary = self.summarize(previous, to_fold, self.summary_token_budget)
+            summary = truncate_to_tokens(summary.strip(), self.summary_token_budget)
+            with self._lock:
+                self.summary = summary
+                self.summarized_count = end
+            logging.info(
+                f"Folded {len(to_fold)} messages into the conversation summary "
+                f"({count_tokens(summary)} tokens) in {time.perf_counter() - start:.2f}s"
+            )
+        except Exception as e:
+            logging.error(f"Failed to update conversation summary: {str(e)}")
+        finally:
+            with self._lock:
+                self._summarizing = False
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a running summary update (headless runs and benchmarks)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not self._summarizing:
+                    return True
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "summarized_messages": self.summarized_count,
+                "summary_tokens": count_tokens(self.summary) if self.summary else 0,
+                "prompt_tokens": list(self.prompt_tokens),
+            }
@@ -0,0 +1,116 @@
+import logging
+import re
+import zlib
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+WORD_RE = re.compile(r"\w[\w+#.]*")
+
+
+class HashingEmbeddings(Embeddings):
+    """Local, deterministic embeddings from hashed character n-grams and words.
+
+    Each text becomes a bag of character n-grams (within word boundaries)
+    and whole words, hashed into ``dimensions`` buckets with a sign bit,
+    weighted by sublinear term frequency and L2-normalised. No network, no
+    model download and about a millisecond per chunk on one core.
+    It captures lexical and spelling similarity, not meaning, so it suits
+    offline runs, load tests and a fallback rather than production quality.
+    """
+
+    def __init__(self, dimensions: int = 512, ngram_range=(3, 5)):
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+        self.model = f"hashing-{ngram_range[0]}-{ngram_range[1]}"
+
+    def _features(self, text: str) -> List[str]:
+        features = []
+        low, high = self.ngram_range
+        for word in WORD_RE.findall(text.lower()):
+            features.append(f"w:{word}")
+            padded = f" {word} "
+            for n in range(low, high + 1):
+                features.extend(padded[i : i + n] for i in range(len(padded) - n + 1))
+        return features
+
+    def _embed(self, text: str) -> List[float]:
+        counts = {}
+        for feature in self._features(text):
+            counts[feature] = counts.get(feature, 0) + 1
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, count in counts.items():
+            digest = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if digest & 1 else -1.0
+            vector[(digest >> 1) % self.dimensions] += sign * (1.0 + np.log(count))
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """Embeddings from a locally installed sentence-transformers model."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = model_name
+        self._model = SentenceTransformer(model_name)
+        self.dimensions = self._model.get_sentence_embedding_dimension()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._model.encode(texts, normalize_embeddings=True).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+# OpenAI models that accept a reduced output dimensionality
+SHORTENABLE_MODELS = {"text-embedding-3-small", "text-embedding-3-large"}
+
+
+def create_embeddings(
+    backend_name: str,
+    model_name: str = "text-embedding-ada-002",
+    dimensions: Optional[int] = None,
+    local_model_name: str = "all-MiniLM-L6-v2",
+    **openai_kwargs,
+) -> Embeddings:
+    """Build the configured embedding backend ("openai", "local" or "hashing").
+
+    ``model_name`` and ``dimensions`` apply to OpenAI (dimensions only for
+    the text-embedding-3 models) and ``dimensions`` to the hashing
+    embeddings. "local" uses sentence-transformers if it is installed and
+    falls back to the hashing embeddings otherwise.
+    """
+    hashing_dimensions = dimensions or 512
+    if backend_name == "local":
+        try:
+            return SentenceTransformerEmbeddings(local_model_name)
+        except Exception as e:
+            logging.warning(
+                f"sentence-transformers model {local_model_name!r} unavailable, "
+                f"using hashing embeddings: {str(e)}"
+            )
+            return HashingEmbeddings(hashing_dimensions)
+    if backend_name == "hashing":
+        return HashingEmbeddings(hashing_dimensions)
+    if backend_name != "openai":
+        logging.warning(f"Unknown embedding backend {backend_name!r}; using OpenAI")
+    from langchain_openai import OpenAIEmbeddings
+
+    if dimensions and model_name not in SHORTENABLE_MODELS:
+        logging.warning(
+            f"{model_name} doesn't support reduced dimensions; "
+            f"ignoring EMBEDDING_DIMENSIONS={dimensions}"
+        )
+        dimensions = None
+    return OpenAIEmbeddings(model=model_name, dimensions=dimensions, **openai_kwargs)
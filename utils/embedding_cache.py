@@ -0,0 +1,172 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that persists vectors in a local SQLite file.
+
+    Vectors are keyed by (embedding model, dimensions, SHA-256 of the text), so
+    the same resume chunk is only ever sent to the embedding API once, across
+    restarts and across every process pointing at the same file. The cache
+    holds at most ``max_entries`` vectors and evicts the least recently used.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        db_path: str,
+        max_entries: int = 100_000,
+        model_name: Optional[str] = None,
+        dimensions: Optional[int] = None,
+    ):
+        self.embeddings = embeddings
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.model_name = model_name or getattr(
+            embeddings, "model", type(embeddings).__name__
+        )
+        self.dimensions = (
+            dimensions
+            if dimensions is not None
+            else getattr(embeddings, "dimensions", None)
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                dimensions INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, dimensions, text_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _key_dims(self) -> int:
+        # SQLite treats NULLs as distinct in primary keys, so use 0 for "default"
+        return self.dimensions or 0
+
+    def _lookup(self, hashes: List[str]) -> dict:
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(unique), 500):
+            batch = unique[start : start + 500]
+            placeholders = ",".join("?" for _ in batch)
+            rows = self._conn.execute(
+                f"SELECT text_hash, vector FROM embeddings "
+                f"WHERE model = ? AND dimensions = ? AND text_hash IN ({placeholders})",
+                [self.model_name, self._key_dims(), *batch],
+            ).fetchall()
+            for text_hash, blob in rows:
+                found[text_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def _evict(self):
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                (overflow,),
+            )
+            self.evictions += overflow
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [self._hash(text) for text in texts]
+        with self._lock:
+            cached = self._lookup(hashes)
+
+        missing = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in cached and text_hash not in missing:
+                missing[text_hash] = text
+
+        if missing:
+            # Only the texts we haven't seen before go to the API
+            new_vectors = self.embeddings.embed_documents(list(missing.values()))
+            for text_hash, vector in zip(missing, new_vectors):
+                cached[text_hash] = vector
+
+        now = time.time()
+        with self._lock:
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings "
+                "(model, dimensions, text_hash, vector, last_used) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        self.model_name,
+                        self._key_dims(),
+                        text_hash,
+                        np.asarray(cached[text_hash], dtype=np.float32).tobytes(),
+                        now,
+                    )
+                    for text_hash in missing
+                ],
+            )
+            # Touch the hits so eviction keeps the chunks people keep re-uploading
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? "
+                "WHERE model = ? AND dimensions = ? AND text_hash = ?",
+                [
+                    (now, self.model_name, self._key_dims(), text_hash)
+                    for text_hash in set(hashes) - set(missing)
+                ],
+            )
+            if missing:
+                self._evict()
+            self._conn.commit()
+
+        logging.info(
+            f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses"
+        )
+        return [cached[text_hash] for text_hash in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        # Queries are one-off and already cached in memory by the caller; keep
+        # them (and a write + eviction scan) off the turn and out of this cache
+        return self.embeddings.embed_query(text)
+
+    def stats(self) -> dict:
+        with self._lock:
+            (entries,) = self._conn.execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,141 @@
+import hashlib
+import logging
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, List, Tuple
+
+import openai
+import pypdf
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, timeouts, dropped connections and 5xx responses are worth retrying."""
+    if isinstance(
+        error,
+        (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError),
+    ):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _embed_batch(
+    embeddings: Embeddings,
+    texts: List[str],
+    batch_number: int,
+    max_retries: int,
+    backoff_seconds: float,
+) -> List[List[float]]:
+    for attempt in range(max_retries + 1):
+        start = time.perf_counter()
+        try:
+            vectors = embeddings.embed_documents(texts)
+            logging.info(
+                f"Embedded batch {batch_number} ({len(texts)} chunks) "
+                f"in {time.perf_counter() - start:.3f}s (attempt {attempt + 1})"
+            )
+            return vectors
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            # Exponential backoff with jitter so parallel batches don't retry in lockstep
+            delay = backoff_seconds * (2**attempt) * (0.5 + random.random())
+            logging.warning(
+                f"Embedding batch {batch_number} failed after "
+                f"{time.perf_counter() - start:.3f}s ({e}); retrying in {delay:.2f}s"
+            )
+            time.sleep(delay)
+
+
+def iter_pdf_pages(pdf_paths: List[str]) -> Iterator[Document]:
+    """Yield one Document per PDF page, extracting text only when the page is requested.
+
+    ``PyPDFLoader.load()`` (and its ``lazy_load``) extracts every page up front;
+    this keeps a single page's text in memory at a time. Metadata matches
+    PyPDFLoader's so downstream code sees the same documents.
+    """
+    for pdf_path in pdf_paths:
+        with open(pdf_path, "rb") as f:
+            reader = pypdf.PdfReader(f)
+            for page_number, page in enumerate(reader.pages):
+                yield Document(
+                    page_content=page.extract_text(),
+                    metadata={"source": pdf_path, "page": page_number},
+                )
+
+
+def iter_chunk_batches(
+    pages: Iterable[Document], text_splitter, batch_size: int
+) -> Iterator[List[Document]]:
+    """Split pages as they arrive and group the chunks into batches of ``batch_size``."""
+    batch = []
+    for page in pages:
+        for chunk in text_splitter.split_documents([page]):
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def stream_embeddings(
+    chunk_batches: Iterable[List[Document]],
+    embeddings: Embeddings,
+    max_concurrency: int = 4,
+    max_retries: int = 5,
+    backoff_seconds: float = 0.5,
+) -> Iterator[Tuple[List[Document], List[List[float]]]]:
+    """Embed batches as they are produced, yielding (chunks, vectors) as each finishes.
+
+    At most ``max_concurrency`` batches are pulled from ``chunk_batches`` and
+    in flight at once, so memory stays bounded however large the input is.
+    Results come back in completion order, not input order.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        in_flight = {}
+        batch_iter = enumerate(chunk_batches)
+        exhausted = False
+        while in_flight or not exhausted:
+            # Top up the window before waiting on anything
+            while not exhausted and len(in_flight) < max(1, max_concurrency):
+                try:
+                    number, batch = next(batch_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                texts = [chunk.page_content for chunk in batch]
+                future = executor.submit(
+                    _embed_batch,
+                    embeddings,
+                    texts,
+                    number,
+                    max_retries,
+                    backoff_seconds,
+                )
+                in_flight[future] = batch
+
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = in_flight.pop(future)
+                yield batch, future.result()
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's bytes, used as the document ID."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_id(doc_id: str, text: str) -> str:
+    """Content-derived chunk ID: re-adding the same chunk of the same document is a no-op."""
+    return hashlib.sha256(f"{doc_id}:{text}".encode("utf-8")).hexdigest()
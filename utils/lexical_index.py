@@ -0,0 +1,133 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+# Keeps tool names like "c++", "c#", "node.js" and "ci/cd" as single tokens
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*")
+
+STOPWORDS = frozenset("""
+    a about after all also am an and any are as at be been but by can could
+    did do does for from had has have he her his how i if in into is it its
+    just me my no not of on or our she so some than that the their them then
+    there they this to was we were what when which who will with would yes
+    you your
+    """.split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens without stopwords."""
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """In-memory Okapi BM25 inverted index over the chunks of one collection.
+
+    Kept in step with the vector backend (same chunk IDs and metadata), so
+    exact terms such as tool names can be matched locally without an
+    embedding call. ``where`` filters support equality on metadata keys.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._docs: Dict[str, Tuple[str, dict, int]] = {}  # id -> (text, meta, len)
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> {id: tf}
+        self._total_length = 0
+
+    def _remove(self, chunk_id: str):
+        text, _, length = self._docs.pop(chunk_id)
+        for term in set(tokenize(text)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= length
+
+    def upsert(self, ids: List[str], texts: List[str], metadatas: List[dict]):
+        with self._lock:
+            for chunk_id, text, metadata in zip(ids, texts, metadatas):
+                if chunk_id in self._docs:
+                    self._remove(chunk_id)
+                terms = Counter(tokenize(text))
+                length = sum(terms.values())
+                self._docs[chunk_id] = (text, dict(metadata or {}), length)
+                self._total_length += length
+                for term, tf in terms.items():
+                    self._postings.setdefault(term, {})[chunk_id] = tf
+
+    def delete(self, where: dict):
+        with self._lock:
+            for chunk_id in [
+                chunk_id
+                for chunk_id, (_, metadata, _) in self._docs.items()
+                if all(metadata.get(key) == value for key, value in where.items())
+            ]:
+                self._remove(chunk_id)
+
+    def clear(self):
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self._total_length = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._docs)
+
+    def vocabulary(self) -> set:
+        """Every term that occurs in at least one chunk."""
+        with self._lock:
+            return set(self._postings)
+
+    def search(
+        self, query: str, k: int, where: Optional[dict] = None
+    ) -> List[Document]:
+        """Top-k chunks by BM25 score; chunks sharing no term with the query are skipped."""
+        with self._lock:
+            if not self._docs or k <= 0:
+                return []
+            doc_count = len(self._docs)
+            avg_length = self._total_length / doc_count or 1.0
+            scores = Counter()
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                for chunk_id, tf in postings.items():
+                    length = self._docs[chunk_id][2]
+                    norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[chunk_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+            results = []
+            for chunk_id, _ in scores.most_common():
+                text, metadata, _ = self._docs[chunk_id]
+                if where and not all(
+                    metadata.get(key) == value for key, value in where.items()
+                ):
+                    continue
+                results.append(Document(page_content=text, metadata=dict(metadata)))
+                if len(results) == k:
+                    break
+            return results
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[Document]], k: int, rrf_k: int = 60
+) -> List[Document]:
+    """Fuse ranked lists by summing 1 / (rrf_k + rank); chunks are matched by ``chunk_id``."""
+    scores = Counter()
+    documents = {}
+    for ranking in rankings:
+        for rank, document in enumerate(ranking, start=1):
+            key = document.metadata.get("chunk_id") or document.page_content
+            scores[key] += 1.0 / (rrf_k + rank)
+            documents.setdefault(key, document)
+    return [documents[key] for key, _ in scores.most_common(k)]
@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe LRU cache with idle-TTL eviction and hit/miss counters.
+
+    Entries are evicted when the cache grows past ``max_entries`` (least
+    recently used first) or when they haven't been read for ``ttl_seconds``.
+    ``on_evict`` is called with each evicted value, outside the cache lock.
+    """
+
+    def __init__(self, max_entries: int = 16, ttl_seconds: float = 3600, on_evict=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self._evicted = []
+        self._entries = OrderedDict()  # key -> (value, last_access)
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expire(self, now: float):
+        if not self.ttl_seconds:
+            return
+        for key in list(self._entries):
+            _, last_access = self._entries[key]
+            if now - last_access > self.ttl_seconds:
+                value, _ = self._entries.pop(key)
+                self._evicted.append(value)
+                self.evictions += 1
+
+    def _flush_evicted(self):
+        with self._lock:
+            evicted, self._evicted = self._evicted, []
+        if self.on_evict:
+            for value in evicted:
+                try:
+                    self.on_evict(value)
+                except Exception as e:
+                    logging.error(f"Error in cache eviction callback: {str(e)}")
+
+    def _lookup(self, key):
+        """Return (found, value); caller must hold the lock."""
+        now = time.monotonic()
+        self._expire(now)
+        if key in self._entries:
+            value, _ = self._entries.pop(key)
+            self._entries[key] = (value, now)
+            return True, value
+        return False, None
+
+    def get(self, key, default=None):
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+                value = default
+        self._flush_evicted()
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, time.monotonic())
+            while len(self._entries) > self.max_entries:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._evicted.append(evicted)
+                self.evictions += 1
+        self._flush_evicted()
+
+    def pop(self, key, default=None):
+        with self._lock:
+            value = self._entries.pop(key, None)
+            return value[0] if value is not None else default
+
+    def get_or_create(self, key, factory):
+        """Return the cached value for ``key``, building it with ``factory`` on a miss.
+
+        Concurrent callers asking for the same key wait for the first build
+        instead of running the factory twice.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+            else:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+        self._flush_evicted()
+        if found:
+            return value
+
+        with key_lock:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    # Another caller built it while we were waiting
+                    self.hits += 1
+                    return value
+                self.misses += 1
+            try:
+                value = factory()
+                self.put(key, value)
+                return value
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._evicted.extend(value for value, _ in self._entries.values())
+            self._entries.clear()
+        self._flush_evicted()
+
+    def values(self) -> list:
+        with self._lock:
+            return [value for value, _ in self._entries.values()]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
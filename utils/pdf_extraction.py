@@ -0,0 +1,125 @@
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Tuple
+
+import pypdf
+from langchain_core.documents import Document
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Process-wide pool for PDF text extraction, created on first use.
+
+    Uses the spawn start method: forking the multi-threaded Streamlit server
+    is not safe.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def count_pages(pdf_path: str) -> int:
+    with open(pdf_path, "rb") as f:
+        return len(pypdf.PdfReader(f).pages)
+
+
+def extract_page_range(pdf_path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """Extract text for pages [start, stop) of one PDF. Runs in a worker process."""
+    with open(pdf_path, "rb") as f:
+        reader = pypdf.PdfReader(f)
+        return [
+            (page_number, reader.pages[page_number].extract_text())
+            for page_number in range(start, min(stop, len(reader.pages)))
+        ]
+
+
+def plan_page_ranges(
+    pdf_paths: List[str], pages_per_task: int
+) -> List[Tuple[str, int, int]]:
+    """Split every PDF into (path, start, stop) tasks of at most ``pages_per_task`` pages."""
+    tasks = []
+    for pdf_path in pdf_paths:
+        page_count = count_pages(pdf_path)
+        for start in range(0, page_count, pages_per_task):
+            tasks.append((pdf_path, start, min(start + pages_per_task, page_count)))
+    return tasks
+
+
+def iter_pdf_pages_parallel(
+    pdf_paths: List[str],
+    max_workers: int = 4,
+    pages_per_task: int = 8,
+    executor: Optional[ProcessPoolExecutor] = None,
+) -> Iterator[Document]:
+    """Yield one Document per page, extracting page ranges in worker processes.
+
+    Resume and cover letter (and the page ranges of long files) are parsed in
+    parallel and only plain text comes back. At most two tasks per worker are
+    outstanding, so memory stays bounded. Pages arrive in file and page order
+    (the section-aware splitter carries a section over from one page to the
+    next); the metadata carries the source and page number.
+
+    Input that fits in a single task (a typical resume) is extracted in this
+    process: starting the spawn pool costs far more than parsing a few pages.
+    """
+    tasks = plan_page_ranges(pdf_paths, pages_per_task)
+    if len(tasks) <= 1:
+        for pdf_path, start, stop in tasks:
+            for page_number, text in extract_page_range(pdf_path, start, stop):
+                yield Document(
+                    page_content=text,
+                    metadata={"source": pdf_path, "page": page_number},
+                )
+        return
+    if executor is None:
+        executor = get_extraction_pool(max_workers)
+
+    window = max(1, max_workers) * 2
+    pending = iter(tasks)
+    in_flight = deque()  # (future, pdf_path) in submission order
+    try:
+        while True:
+            for pdf_path, start, stop in pending:
+                future = executor.submit(extract_page_range, pdf_path, start, stop)
+                in_flight.append((future, pdf_path))
+                if len(in_flight) >= window:
+                    break
+            if not in_flight:
+                return
+
+            # Later ranges keep extracting while we wait on the oldest one
+            future, pdf_path = in_flight.popleft()
+            for page_number, text in future.result():
+                yield Document(
+                    page_content=text,
+                    metadata={"source": pdf_path, "page": page_number},
+                )
+    except BrokenProcessPool as e:
+        # A crashed worker breaks the whole pool; start fresh next time.
+        # Errors from a single file leave the pool usable, so they just propagate.
+        logging.error(f"PDF extraction pool broke: {str(e)}")
+        if executor is _pool:
+            _reset_pool()
+        raise
+    finally:
+        for future, _ in in_flight:
+            future.cancel()
@@ -0,0 +1,78 @@
+"""Prompt layout that lets the provider's prefix cache do its job, and its hit rate.
+
+OpenAI caches the longest previously seen prompt prefix (from 1024 tokens
+on), so anything that changes from turn to turn should come as late as
+possible. ``assemble_messages`` lays a turn out as:
+
+    system   static instructions + reference material (same every turn)
+    ...      conversation history
+    system   this turn's notes: interview stage, extra retrieved context
+    user     the candidate's latest message, once
+
+A plain transcript only grows at the end, so the whole previous prompt up
+to the turn notes is reused. With ``ConversationMemory`` the history opens
+with a rolling summary: once older turns start being folded in, the
+summary changes every turn and the reusable prefix stops at it.
+
+``record_usage`` collects ``cached_tokens`` from each completion's usage so
+the hit ratio can be watched.
+"""
+
+import logging
+import threading
+from collections import Counter
+from typing import List, Optional
+
+_lock = threading.Lock()
+usage_totals = Counter()
+
+
+def assemble_messages(
+    instructions: str,
+    reference: str,
+    history: List[dict],
+    latest_message: str,
+    turn_notes: str = "",
+) -> List[dict]:
+    """Build the chat messages for one turn, stable parts first."""
+    system_prompt = instructions
+    if reference.strip():
+        system_prompt += "\n\n" + reference.strip()
+    messages = [{"role": "system", "content": system_prompt}]
+    messages.extend(history)
+    if turn_notes.strip():
+        messages.append({"role": "system", "content": turn_notes.strip()})
+    messages.append({"role": "user", "content": latest_message})
+    return messages
+
+
+def record_usage(usage, metrics: Optional[dict] = None) -> dict:
+    """Record a completion's token usage (an OpenAI ``CompletionUsage``)."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    turn = {
+        "prompt_tokens": usage.prompt_tokens,
+        "cached_tokens": getattr(details, "cached_tokens", None) or 0,
+        "completion_tokens": usage.completion_tokens,
+    }
+    with _lock:
+        usage_totals["requests"] += 1
+        usage_totals.update(turn)
+    if metrics is not None:
+        metrics.update(turn)
+    logging.info(f"Prompt cache: {turn}; totals {prompt_cache_stats()}")
+    return turn
+
+
+def prompt_cache_stats() -> dict:
+    with _lock:
+        prompt_tokens = usage_totals["prompt_tokens"]
+        return {
+            "requests": usage_totals["requests"],
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": usage_totals["cached_tokens"],
+            "hit_ratio": (
+                round(usage_totals["cached_tokens"] / prompt_tokens, 3)
+                if prompt_tokens
+                else 0.0
+            ),
+        }
@@ -0,0 +1,225 @@
+import re
+from typing import List, Optional
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
+
+# Common resume / CV section headings, matched case-insensitively on their own line
+SECTION_HEADINGS = {
+    "summary": "Summary",
+    "professional summary": "Summary",
+    "profile": "Summary",
+    "objective": "Summary",
+    "about me": "Summary",
+    "experience": "Experience",
+    "work experience": "Experience",
+    "professional experience": "Experience",
+    "employment": "Experience",
+    "employment history": "Experience",
+    "work history": "Experience",
+    "projects": "Projects",
+    "personal projects": "Projects",
+    "selected projects": "Projects",
+    "skills": "Skills",
+    "technical skills": "Skills",
+    "core competencies": "Skills",
+    "technologies": "Skills",
+    "education": "Education",
+    "certifications": "Certifications",
+    "certificates": "Certifications",
+    "publications": "Publications",
+    "awards": "Awards",
+    "honors and awards": "Awards",
+    "leadership": "Leadership",
+    "volunteering": "Volunteering",
+    "volunteer experience": "Volunteering",
+    "interests": "Interests",
+    "languages": "Languages",
+}
+
+# Sections made of several entries (one role / project each)
+ENTRY_SECTIONS = {"Experience", "Projects", "Leadership", "Volunteering"}
+
+BULLET_RE = re.compile(r"^\s*(?:[-*•▪◦●‣–]|\d+[.)])\s+")
+HEADING_SUFFIX_RE = re.compile(r"[\s:|\-–—]+$")
+
+
+def match_heading(line: str) -> Optional[str]:
+    """Return the canonical section name if ``line`` is a section heading."""
+    text = HEADING_SUFFIX_RE.sub("", line.strip())
+    if not text or len(text) > 40:
+        return None
+    return SECTION_HEADINGS.get(text.lower())
+
+
+class ResumeSectionSplitter:
+    """Split resumes along their sections instead of every N characters.
+
+    Headings such as Experience, Projects, Skills or Education start a new
+    section; inside entry sections (Experience, Projects, ...) every role or
+    project is an entry that is never split between chunks, and the other
+    sections are kept whole.
+    Chunks carry ``section`` metadata and are prefixed with the section name
+    so they read on their own. Consecutive entries and short sections (Skills,
+    Education) are packed together until a chunk reaches ``min_chunk_size``
+    (half the cap by default), never splitting an entry; such chunks list
+    every section they hold. Text without recognisable headings (cover
+    letters, job descriptions) is packed paragraph by paragraph. Nothing is
+    duplicated between chunks; only oversized entries fall back to the
+    character splitter.
+
+    The splitter remembers the current section between consecutive pages of
+    the same file, so a section that continues on the next page stays in the
+    same section; any other page starts without one. Use one instance per
+    document.
+    """
+
+    def __init__(
+        self, max_chunk_size: int = 1000, min_chunk_size: Optional[int] = None
+    ):
+        self.max_chunk_size = max_chunk_size
+        self.min_chunk_size = (
+            min_chunk_size if min_chunk_size is not None else max_chunk_size // 2
+        )
+        self._fallback = RecursiveCharacterTextSplitter(
+            chunk_size=max_chunk_size, chunk_overlap=0
+        )
+        self._section = None
+        self._last_page = None  # (source, page) of the previous document
+
+    def _entries(self, section: Optional[str], lines: List[str]) -> List[str]:
+        """Group a section's lines into entries (one per role/project)."""
+        if section not in ENTRY_SECTIONS:
+            return ["\n".join(lines)]
+
+        entries, current, seen_bullet = [], [], False
+        for line in lines:
+            is_bullet = bool(BULLET_RE.match(line))
+            # A non-bullet line after bullets is the title of the next entry
+            if not is_bullet and seen_bullet and current:
+                entries.append("\n".join(current))
+                current, seen_bullet = [], False
+            current.append(line)
+            seen_bullet = seen_bullet or is_bullet
+        if current:
+            entries.append("\n".join(current))
+        return entries
+
+    def _paragraphs(self, text: str) -> List[str]:
+        """Pack paragraphs (or lines, if the PDF lost blank lines) up to the size cap."""
+        blocks = [block.strip() for block in re.split(r"\n\s*\n", text)]
+        if len(blocks) > 1:
+            return self._pack([block for block in blocks if block], "\n\n")
+        # Single lines aren't meaningful units, so fill chunks up to the cap
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        return self._pack(lines, "\n", target=self.max_chunk_size)
+
+    def _pack(
+        self, pieces: List[str], separator: str, target: Optional[int] = None
+    ) -> List[str]:
+        """Merge consecutive pieces while the current chunk is under ``target``."""
+        target = target or self.min_chunk_size
+        packed = []
+        for piece in pieces:
+            if (
+                packed
+                and len(packed[-1]) < target
+                and len(packed[-1]) + len(separator) + len(piece) <= self.max_chunk_size
+            ):
+                packed[-1] = packed[-1] + separator + piece
+            else:
+                packed.append(piece)
+        return packed
+
+    @staticmethod
+    def _render(groups: List[tuple]) -> str:
+        return "\n\n".join(
+            (f"{section}\n" if section else "") + "\n".join(parts)
+            for section, parts in groups
+        )
+
+    def _pack_sections(self, pieces: List[tuple]) -> List[dict]:
+        """Pack (section, text) pieces in order until each chunk reaches the minimum.
+
+        A piece joining a chunk that ends in its section doesn't repeat the heading.
+        """
+        chunks = []  # [(section, [text, ...]), ...] groups per chunk
+        for section, text in pieces:
+            if chunks and len(self._render(chunks[-1])) < self.min_chunk_size:
+                groups = list(chunks[-1])
+                if groups[-1][0] == section:
+                    groups[-1] = (section, groups[-1][1] + [text])
+                else:
+                    groups.append((section, [text]))
+                if len(self._render(groups)) <= self.max_chunk_size:
+                    chunks[-1] = groups
+                    continue
+            chunks.append([(section, [text])])
+        return [
+            {
+                "section": ", ".join(
+                    dict.fromkeys(section for section, _ in groups if section)
+                )
+                or None,
+                "text": self._render(groups),
+            }
+            for groups in chunks
+        ]
+
+    def split_text(self, text: str) -> List[dict]:
+        """Return [{"section": ..., "text": ...}] for one page of text."""
+        sections = []  # (section, [lines])
+        current_lines = []
+        section = self._section
+        found_heading = False
+        for line in text.splitlines():
+            if not line.strip():
+                current_lines.append("")
+                continue
+            heading = match_heading(line)
+            if heading:
+                found_heading = True
+                if any(l.strip() for l in current_lines):
+                    sections.append((section, current_lines))
+                section, current_lines = heading, []
+            else:
+                current_lines.append(line.strip())
+        if any(l.strip() for l in current_lines):
+            sections.append((section, current_lines))
+        self._section = section
+
+        if not found_heading and section is None:
+            return [
+                {"section": None, "text": chunk} for chunk in self._paragraphs(text)
+            ]
+
+        pieces = []
+        for section_name, lines in sections:
+            lines = [line for line in lines if line]
+            for entry in self._entries(section_name, lines):
+                # Leave room for the section heading the chunk is prefixed with
+                limit = self.max_chunk_size - len(section_name or "") - 1
+                for part in (
+                    self._fallback.split_text(entry) if len(entry) > limit else [entry]
+                ):
+                    pieces.append((section_name, part))
+        return self._pack_sections(pieces)
+
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        chunks = []
+        for document in documents:
+            page = (document.metadata.get("source"), document.metadata.get("page"))
+            if (
+                page[1] is None
+                or self._last_page is None
+                or page != (self._last_page[0], self._last_page[1] + 1)
+            ):
+                # Not the page after the previous one: don't carry its section over
+                self._section = None
+            self._last_page = page if page[1] is not None else None
+            for piece in self.split_text(document.page_content):
+                metadata = dict(document.metadata)
+                if piece["section"]:
+                    metadata["section"] = piece["section"]
+                chunks.append(Document(page_content=piece["text"], metadata=metadata))
+        return chunks
@@ -0,0 +1,81 @@
+import re
+import threading
+from collections import Counter
+from typing import Optional
+
+from utils.lexical_index import tokenize
+
+# Turns that ask the interviewer to repeat or clarify; they don't change the topic
+CLARIFICATION_RE = re.compile(
+    r"\b(repeat|rephrase|say that again|come again|pardon|what do you mean|"
+    r"didn'?t (catch|understand|get)|not sure what you mean|sorry\??$)",
+    re.IGNORECASE,
+)
+
+# Below this share of new content terms a turn continues the previous topic
+MIN_NOVELTY = 0.3
+
+decision_counts = Counter()
+_counts_lock = threading.Lock()
+
+
+def decide_retrieval(
+    query: str,
+    previous: Optional[dict] = None,
+    vocabulary=None,
+    max_k: int = 3,
+) -> dict:
+    """Decide how much retrieval a turn needs, using only local signals.
+
+    ``previous`` is the retrieval state of the last turn ({"terms": [...],
+    "context": ...}), ``vocabulary`` the set of terms in the index (if
+    known). Returns {"action", "k", "reason"} where action is one of:
+
+    - "skip": no retrieval, no document context (nothing worth looking up)
+    - "reuse": no retrieval, reuse the previous turn's context
+    - "retrieve": retrieve ``k`` chunks (fewer than ``max_k`` for short turns)
+    """
+    terms = set(tokenize(query))
+    has_previous = bool(previous and previous.get("context"))
+    previous_terms = set(previous.get("terms", [])) if previous else set()
+
+    if CLARIFICATION_RE.search(query) or not terms:
+        reason = "clarification" if terms else "no content terms"
+        if has_previous:
+            return {"action": "reuse", "k": 0, "reason": reason}
+        return {"action": "skip", "k": 0, "reason": reason}
+
+    if has_previous:
+        novelty = len(terms - previous_terms) / len(terms)
+        if novelty < MIN_NOVELTY:
+            return {"action": "reuse", "k": 0, "reason": f"novelty {novelty:.2f}"}
+
+    if vocabulary is not None and len(terms) <= 3 and not terms & vocabulary:
+        # A short answer sharing no term with the documents ("Sounds good")
+        return {"action": "skip", "k": 0, "reason": "no overlap with documents"}
+
+    # Short answers carry one topic; long ones can touch several
+    if len(terms) <= 2:
+        k = 1
+    elif len(terms) <= 6:
+        k = min(2, max_k)
+    else:
+        k = max_k
+    return {"action": "retrieve", "k": k, "reason": f"{len(terms)} content terms"}
+
+
+def record_decision(decision: dict, chunks_saved: int = 0):
+    """Count the decision and how many chunk retrievals it saved."""
+    with _counts_lock:
+        decision_counts[decision["action"]] += 1
+        decision_counts["turns"] += 1
+        decision_counts["chunks_saved"] += chunks_saved
+
+
+def policy_stats() -> dict:
+    with _counts_lock:
+        stats = dict(decision_counts)
+    turns = stats.get("turns", 0)
+    skipped = stats.get("skip", 0) + stats.get("reuse", 0)
+    stats["skip_rate"] = skipped / turns if turns else 0.0
+    return stats
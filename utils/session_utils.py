@@ -1,4 +1,8 @@
+import hashlib
 import streamlit as st
+from tempfile import NamedTemporaryFile
+
+from utils.ingestion import file_digest
 
 def reset_interview():
     """Reset the interview session state to start a new interview"""
@@ -50,4 +54,36 @@ def upload_new_documents():
     """Start fresh with new documents"""
     st.session_state.continue_with_existing = False
     st.session_state.show_document_options = False
-    reset_interview() 
\ No newline at end of file
+    reset_interview()
+
+
+def save_uploaded_pdf(uploaded_file):
+    """Write an uploaded PDF to a temp file once and return its path.
+
+    Streamlit reruns the script on every widget interaction, so paths are
+    remembered per file content to avoid rewriting (and re-indexing) the
+    same upload over and over.
+    """
+    data = uploaded_file.getvalue()
+    digest = hashlib.sha256(data).hexdigest()
+
+    if "uploaded_pdf_paths" not in st.session_state:
+        st.session_state.uploaded_pdf_paths = {}
+
+    if digest not in st.session_state.uploaded_pdf_paths:
+        with NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
+            temp_file.write(data)
+            st.session_state.uploaded_pdf_paths[digest] = temp_file.name
+
+    return st.session_state.uploaded_pdf_paths[digest]
+
+
+def get_candidate_id(resume_path):
+    """ID for the candidate's index: the resume's content digest, or None without a resume.
+
+    It survives reruns, restarts and "upload new documents", so editing the
+    job description or swapping the cover letter only re-indexes what changed.
+    """
+    if not resume_path:
+        return None
+    return file_digest(resume_path)
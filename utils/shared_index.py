@@ -0,0 +1,264 @@
+"""Read-only, memory-mapped vector index for corpora shared by worker processes.
+
+An index directory holds flat files that every process maps read-only, so
+the OS page cache keeps one copy no matter how many workers open it:
+
+    index.json          sidecar: format, count, dimensions, collection
+                        metadata and the value list of each metadata column
+    vectors.npy         float32 L2-normalised rows (n x d)
+    texts.bin           UTF-8 chunk texts, back to back
+    text_offsets.npy    int64 (n + 1) byte offsets into texts.bin
+    ids.bin, id_offsets.npy, metadatas.bin, metadata_offsets.npy
+                        chunk IDs and per-chunk metadata (JSON), same layout
+    columns/<key>.npy   int32 code per row for each scalar metadata key, for
+                        equality filters (-1 = missing)
+
+Build one with ``write_mapped_index`` or from PDFs with:
+
+    python -m utils.shared_index OUTPUT_DIR handbook.pdf jd_library.pdf
+"""
+
+import argparse
+import json
+import mmap
+import os
+import shutil
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+FORMAT_VERSION = 1
+
+
+def _write_strings(path: str, name: str, offsets_name: str, strings: List[str]):
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    with open(os.path.join(path, name), "wb") as f:
+        for i, string in enumerate(strings):
+            data = string.encode("utf-8")
+            f.write(data)
+            offsets[i + 1] = offsets[i] + len(data)
+    np.save(os.path.join(path, offsets_name), offsets)
+
+
+def write_mapped_index(
+    path: str,
+    ids: List[str],
+    vectors,
+    texts: List[str],
+    metadatas: List[dict],
+    metadata: Optional[dict] = None,
+):
+    """Write a shared index directory; replaces ``path`` atomically."""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim != 2 or len(matrix) != len(ids):
+        raise ValueError("vectors must be an (n, d) matrix with one row per id")
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix = matrix / norms
+
+    tmp_path = f"{path.rstrip(os.sep)}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(os.path.join(tmp_path, "columns"))
+    np.save(os.path.join(tmp_path, "vectors.npy"), matrix)
+    _write_strings(tmp_path, "texts.bin", "text_offsets.npy", texts)
+    _write_strings(tmp_path, "ids.bin", "id_offsets.npy", ids)
+    _write_strings(
+        tmp_path,
+        "metadatas.bin",
+        "metadata_offsets.npy",
+        [json.dumps(m or {}, sort_keys=True) for m in metadatas],
+    )
+
+    columns = {}
+    keys = {key for m in metadatas for key, value in (m or {}).items()}
+    for key in sorted(keys):
+        values = sorted(
+            {
+                (m or {})[key]
+                for m in metadatas
+                if isinstance((m or {}).get(key), (str, int, float, bool))
+            },
+            key=repr,
+        )
+        codes_by_value = {value: code for code, value in enumerate(values)}
+        codes = np.array(
+            [codes_by_value.get((m or {}).get(key), -1) for m in metadatas],
+            dtype=np.int32,
+        )
+        np.save(os.path.join(tmp_path, "columns", f"{key}.npy"), codes)
+        columns[key] = values
+
+    with open(os.path.join(tmp_path, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "format": FORMAT_VERSION,
+                "count": len(ids),
+                "dimensions": int(matrix.shape[1]) if len(matrix) else 0,
+                "metadata": metadata or {},
+                "columns": columns,
+            },
+            f,
+        )
+
+    old_path = f"{path.rstrip(os.sep)}.old"
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+class _MappedStrings:
+    """Strings stored back to back in a memory-mapped file."""
+
+    def __init__(self, path: str, name: str, offsets_name: str):
+        self.offsets = np.load(os.path.join(path, offsets_name), mmap_mode="r")
+        with open(os.path.join(path, name), "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            # mmap can't map an empty file
+            self.data = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            )
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        start, stop = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self.data[start:stop].decode("utf-8")
+
+
+class MappedBackend:
+    """Read-only vector backend over a ``write_mapped_index`` directory.
+
+    Opening only reads the small sidecar and maps the files, so it takes
+    milliseconds regardless of corpus size, and the vectors and texts live
+    in the shared page cache rather than each process's heap.
+    """
+
+    name = "mapped"
+    read_only = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self.collection_name = os.path.basename(path.rstrip(os.sep))
+        with open(os.path.join(path, "index.json"), encoding="utf-8") as f:
+            self._index = json.load(f)
+        if self._index.get("format") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported shared index format {self._index.get('format')!r}"
+            )
+        self._vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self._texts = _MappedStrings(path, "texts.bin", "text_offsets.npy")
+        self._ids = _MappedStrings(path, "ids.bin", "id_offsets.npy")
+        self._metadatas = _MappedStrings(path, "metadatas.bin", "metadata_offsets.npy")
+        self._columns = {}
+        self._id_set = None
+
+    def _read_only(self, *args, **kwargs):
+        raise RuntimeError(f"Shared index {self.path} is read-only")
+
+    upsert = delete = set_metadata = delete_collection = _read_only
+
+    def get_metadata(self) -> dict:
+        return dict(self._index["metadata"])
+
+    def count(self) -> int:
+        return self._index["count"]
+
+    def existing_ids(self, ids: List[str]) -> set:
+        if self._id_set is None:
+            self._id_set = {self._ids[i] for i in range(len(self._ids))}
+        return {chunk_id for chunk_id in ids if chunk_id in self._id_set}
+
+    def all_chunks(self):
+        """Return (ids, texts, metadatas) for every chunk (reads the whole corpus)."""
+        rows = range(self.count())
+        return (
+            [self._ids[i] for i in rows],
+            [self._texts[i] for i in rows],
+            [json.loads(self._metadatas[i]) for i in rows],
+        )
+
+    def _column(self, key: str):
+        if key not in self._columns:
+            column_path = os.path.join(self.path, "columns", f"{key}.npy")
+            self._columns[key] = (
+                np.load(column_path, mmap_mode="r")
+                if os.path.exists(column_path)
+                else None
+            )
+        return self._columns[key]
+
+    def _mask(self, where: Optional[dict]) -> Optional[np.ndarray]:
+        if not where:
+            return None
+        mask = np.ones(self.count(), dtype=bool)
+        for key, value in where.items():
+            values = self._index["columns"].get(key, [])
+            column = self._column(key)
+            if column is None or value not in values:
+                return np.zeros(self.count(), dtype=bool)
+            mask &= column == values.index(value)
+        return mask
+
+    def search(
+        self, query_vector: List[float], k: int, where: Optional[dict] = None
+    ) -> List[Document]:
+        if self.count() == 0 or k <= 0:
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        scores = self._vectors @ (query / norm if norm else query)
+        mask = self._mask(where)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+            k = min(k, int(mask.sum()))
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            Document(
+                page_content=self._texts[i], metadata=json.loads(self._metadatas[i])
+            )
+            for i in top
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a shared, memory-mapped index from PDFs."
+    )
+    parser.add_argument("output", help="index directory to (re)write")
+    parser.add_argument("pdfs", nargs="+")
+    args = parser.parse_args()
+
+    import config
+
+    # Ingest with the normal pipeline into a throwaway in-memory collection
+    config.VECTOR_BACKEND = "numpy"
+    config.NUMPY_PERSIST_DIR = ""
+    config.VECTOR_QUANTIZATION = "none"
+    from generate_answer import VectorDB
+
+    vector_db = VectorDB(args.pdfs)
+    vector_db.wait_until_complete()
+    if not vector_db.is_available or vector_db.error:
+        raise SystemExit(f"Ingestion failed: {vector_db.error}")
+    ids, texts, metadatas = vector_db.backend.all_chunks()
+    write_mapped_index(
+        args.output,
+        ids,
+        vector_db.backend.vectors(),
+        texts,
+        metadatas,
+        vector_db.backend.get_metadata(),
+    )
+    print(f"Wrote {len(ids)} chunks to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import logging
+import threading
+
+_lock = threading.Lock()
+_encodings = {}
+
+
+def get_encoding(model_name: str = "gpt-4o"):
+    """tiktoken encoding for a model, or None if tiktoken (or its BPE files) is unavailable.
+
+    The result, including a failure, is cached so a missing tokenizer
+    doesn't cost a download attempt on every call.
+    """
+    with _lock:
+        if model_name not in _encodings:
+            try:
+                import tiktoken
+
+                _encodings[model_name] = tiktoken.encoding_for_model(model_name)
+            except Exception as e:
+                logging.warning(
+                    f"No local tokenizer for {model_name}, estimating tokens: {str(e)}"
+                )
+                _encodings[model_name] = None
+        return _encodings[model_name]
+
+
+def count_tokens(text: str, model_name: str = "gpt-4o") -> int:
+    """Token count for ``text``; about four characters per token without tiktoken."""
+    encoding = get_encoding(model_name)
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model_name: str = "gpt-4o") -> str:
+    """Cut ``text`` to at most ``max_tokens`` tokens, at a word boundary if possible."""
+    if max_tokens <= 0:
+        return ""
+    encoding = get_encoding(model_name)
+    if encoding is None:
+        cut = text[: max_tokens * 4]
+    else:
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        cut = encoding.decode(tokens[:max_tokens])
+    if len(cut) < len(text) and " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut
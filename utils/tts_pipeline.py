@@ -0,0 +1,205 @@
+"""Speak a reply while it is still being generated.
+
+``SentenceSplitter`` cuts the streamed text at sentence boundaries,
+``SpeechPipeline`` synthesizes each finished sentence on a worker pool and
+hands the clips back in order, and ``clip_html`` builds the browser side:
+one audio queue on the page that plays the clips back to back, in order,
+whatever order they arrive in.
+"""
+
+import base64
+import json
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional
+
+# Sentence end: . ! ? (optionally closed by quotes/brackets) followed by space
+SENTENCE_END_RE = re.compile(r"[.!?]+[\"')\]]*\s+")
+# Words ending in a period that don't end a sentence
+ABBREVIATIONS = {"e.g.", "i.e.", "etc.", "vs.", "dr.", "mr.", "mrs.", "ms.", "inc."}
+
+
+class SentenceSplitter:
+    """Incrementally split streamed text into sentences.
+
+    Sentences shorter than ``min_chars`` are held back and joined with the
+    next one (fewer, less choppy TTS calls); text running past ``max_chars``
+    without a sentence end is cut at the last comma or space.
+    """
+
+    def __init__(self, min_chars: int = 20, max_chars: int = 300):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def _is_boundary(self, match) -> bool:
+        words = self._buffer[: match.start() + 1].split()
+        return not words or words[-1].lower() not in ABBREVIATIONS
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text; return the sentences it completed."""
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_END_RE.finditer(self._buffer):
+            if match.end() - start >= self.min_chars and self._is_boundary(match):
+                sentences.append(self._buffer[start : match.end()].strip())
+                start = match.end()
+        self._buffer = self._buffer[start:]
+        while len(self._buffer) > self.max_chars:
+            cut = max(
+                self._buffer.rfind(", ", 0, self.max_chars) + 1,
+                self._buffer.rfind(" ", 0, self.max_chars),
+            )
+            if cut <= 0:
+                cut = self.max_chars
+            sentences.append(self._buffer[:cut].strip())
+            self._buffer = self._buffer[cut:]
+        return [sentence for sentence in sentences if sentence]
+
+    def flush(self) -> List[str]:
+        """Return whatever is left once the stream has ended."""
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+
+class SpeechPipeline:
+    """Synthesize sentences concurrently, yielding clips in sentence order.
+
+    ``synthesize(text) -> bytes`` runs on ``max_workers`` threads. A clip
+    that fails to synthesize is skipped (logged) so the rest still play.
+    """
+
+    def __init__(
+        self,
+        synthesize: Callable[[str], bytes],
+        max_workers: int = 3,
+        splitter: Optional[SentenceSplitter] = None,
+    ):
+        self.synthesize = synthesize
+        self.splitter = splitter or SentenceSplitter()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tts"
+        )
+        self._futures = []  # (sentence, future), in sentence order
+        self._next = 0  # next sentence whose clip is handed out
+        self._clips = 0  # clips handed out; numbered without gaps for the player
+        self._start = time.perf_counter()
+        self.first_clip_seconds = None
+
+    def _timed_synthesize(self, sentence: str) -> bytes:
+        audio = self.synthesize(sentence)
+        if self.first_clip_seconds is None and audio:
+            self.first_clip_seconds = time.perf_counter() - self._start
+        return audio
+
+    def feed(self, text: str):
+        for sentence in self.splitter.feed(text):
+            self._submit(sentence)
+
+    def _submit(self, sentence: str):
+        self._futures.append(
+            (sentence, self._executor.submit(self._timed_synthesize, sentence))
+        )
+
+    def close(self):
+        """Mark the end of the text; queues the final partial sentence."""
+        for sentence in self.splitter.flush():
+            self._submit(sentence)
+        self._executor.shutdown(wait=False)
+
+    def cancel(self):
+        """Stop early: sentences not being synthesized yet are dropped."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _take(self, block: bool) -> Iterator[dict]:
+        while self._next < len(self._futures):
+            sentence, future = self._futures[self._next]
+            if not block and not future.done():
+                return
+            self._next += 1
+            try:
+                audio = future.result()
+            except Exception as e:
+                logging.error(f"Speech synthesis failed for {sentence!r}: {str(e)}")
+                continue
+            if audio:
+                self._clips += 1
+                yield {"index": self._clips - 1, "text": sentence, "audio": audio}
+
+    def ready_clips(self) -> Iterator[dict]:
+        """Clips that are done, in order, without waiting for later ones."""
+        return self._take(block=False)
+
+    def remaining_clips(self) -> Iterator[dict]:
+        """All clips not handed out yet, waiting for each in turn."""
+        return self._take(block=True)
+
+    def stats(self) -> dict:
+        return {
+            "sentences": len(self._futures),
+            "first_clip_seconds": self.first_clip_seconds,
+        }
+
+
+# Installed once into the parent page (components run in iframes that are
+# dropped on the next rerun, so the queue must not live in them). Clips are
+# decoded as they arrive and scheduled back to back on one AudioContext, in
+# sequence order; a new turn id cuts off whatever is still playing.
+_PLAYER_JS = """
+(function () {
+  if (window.__interviewAudio) return;
+  var q = {ctx: null, turn: null, expected: 0, pending: {}, sources: [], end: 0};
+  q.reset = function (turn) {
+    q.sources.forEach(function (s) { try { s.stop(); } catch (e) {} });
+    q.turn = turn; q.expected = 0; q.pending = {}; q.sources = []; q.end = 0;
+  };
+  q.pump = function () {
+    var clip;
+    while ((clip = q.pending[q.expected]) && clip.buffer !== undefined) {
+      delete q.pending[q.expected];
+      q.expected += 1;
+      if (!clip.buffer) continue;  // failed to decode
+      var source = q.ctx.createBufferSource();
+      source.buffer = clip.buffer;
+      source.connect(q.ctx.destination);
+      var start = Math.max(q.ctx.currentTime + 0.05, q.end);
+      source.start(start);
+      q.end = start + clip.buffer.duration;
+      q.sources.push(source);
+    }
+  };
+  q.push = function (turn, seq, b64) {
+    if (!q.ctx) q.ctx = new (window.AudioContext || window.webkitAudioContext)();
+    if (q.ctx.state === "suspended") q.ctx.resume();
+    if (turn !== q.turn) q.reset(turn);
+    var bytes = Uint8Array.from(atob(b64), function (c) { return c.charCodeAt(0); });
+    var clip = {};
+    q.pending[seq] = clip;
+    q.ctx.decodeAudioData(bytes.buffer).then(
+      function (buffer) { clip.buffer = buffer; },
+      function () { clip.buffer = null; }
+    ).then(function () { if (turn === q.turn) q.pump(); });
+  };
+  window.__interviewAudio = q;
+})();
+"""
+
+
+def clip_html(turn_id: str, index: int, audio: bytes) -> str:
+    """Markup for a zero-height component that queues one clip for playback."""
+    return f"""
+<script>
+(function () {{
+  var parent = window.parent;
+  if (!parent.__interviewAudio) {{
+    var script = parent.document.createElement("script");
+    script.textContent = {json.dumps(_PLAYER_JS)};
+    parent.document.head.appendChild(script);
+  }}
+  parent.__interviewAudio.push({json.dumps(turn_id)}, {index}, "{base64.b64encode(audio).decode("ascii")}");
+}})();
+</script>
+"""
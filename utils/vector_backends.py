@@ -0,0 +1,442 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+
+class ChromaBackend:
+    """Vector storage in a (persistent) Chroma collection."""
+
+    name = "chroma"
+
+    def __init__(self, collection_name: str, client):
+        self.collection_name = collection_name
+        self.client = client
+        try:
+            self.collection = client.get_collection(collection_name)
+        except Exception:
+            # Stamp new collections so the retention sweep sees them as fresh.
+            # (get_or_create_collection would overwrite an existing one's metadata.)
+            try:
+                self.collection = client.create_collection(
+                    collection_name, metadata={"last_used": time.time()}
+                )
+            except Exception:
+                # Another worker created it in the meantime
+                self.collection = client.get_collection(collection_name)
+
+    def get_metadata(self) -> dict:
+        return dict(self.collection.metadata or {})
+
+    def set_metadata(self, metadata: dict):
+        self.collection.modify(metadata=metadata or None)
+
+    def upsert(
+        self,
+        ids: List[str],
+        vectors: List[List[float]],
+        texts: List[str],
+        metadatas: List[dict],
+    ):
+        self.collection.upsert(
+            ids=ids, embeddings=vectors, documents=texts, metadatas=metadatas
+        )
+
+    def existing_ids(self, ids: List[str]) -> set:
+        return set(self.collection.get(ids=ids, include=[])["ids"])
+
+    def delete(self, where: dict):
+        self.collection.delete(where=where)
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def all_chunks(self):
+        """Return (ids, texts, metadatas) for every stored chunk."""
+        result = self.collection.get(include=["documents", "metadatas"])
+        return result["ids"], result["documents"], result["metadatas"]
+
+    def search(
+        self, query_vector: List[float], k: int, where: Optional[dict] = None
+    ) -> List[Document]:
+        if k <= 0 or self.collection.count() == 0:
+            return []
+        result = self.collection.query(
+            query_embeddings=[query_vector],
+            n_results=k,
+            where=where,
+            include=["documents", "metadatas", "distances"],
+        )
+        return [
+            Document(page_content=text, metadata=metadata or {})
+            for text, metadata in zip(result["documents"][0], result["metadatas"][0])
+        ]
+
+    def delete_collection(self):
+        self.client.delete_collection(self.collection_name)
+
+
+class NumpyBackend:
+    """Brute-force in-memory vector storage for small corpora.
+
+    Vectors are L2-normalised float32 rows of one matrix, so top-k is a single
+    matrix-vector product followed by ``argpartition``. A resume plus cover
+    letter is a few dozen chunks, where this beats building and querying an
+    ANN index by orders of magnitude. ``where`` filters support equality on
+    metadata keys, like the subset of Chroma filters used here.
+
+    With a ``persist_dir`` the collection is saved there after every write
+    and reloaded on start. ``quantization`` "float16" or "int8" (one float32
+    scale per vector) needs one: candidates are scored on the quantized rows,
+    the only resident matrix (2x / 4x smaller), and the best
+    ``rescore_factor * k`` are re-scored exactly against the float32 rows,
+    memory-mapped from disk so only those rows are paged in. Without a
+    ``persist_dir`` the float32 rows would have to stay in memory next to the
+    codes, so quantization is ignored (with a warning).
+    """
+
+    name = "numpy"
+    QUANTIZATIONS = ("none", "float16", "int8")
+    SCORE_BLOCK_ROWS = 2048
+
+    def __init__(
+        self,
+        collection_name: str,
+        persist_dir: Optional[str] = None,
+        quantization: str = "none",
+        rescore_factor: int = 4,
+    ):
+        if quantization not in self.QUANTIZATIONS:
+            logging.warning(f"Unknown quantization {quantization!r}; storing float32")
+            quantization = "none"
+        if quantization != "none" and not persist_dir:
+            # The float32 rows would stay resident next to the codes: more
+            # memory than not quantizing at all
+            logging.warning(
+                f"Quantization {quantization!r} needs a persist directory; "
+                "storing float32"
+            )
+            quantization = "none"
+        self.collection_name = collection_name
+        self.quantization = quantization
+        self.rescore_factor = rescore_factor
+        self.path = os.path.join(persist_dir, collection_name) if persist_dir else None
+        self._lock = threading.RLock()
+        self._metadata = {}
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._texts: List[str] = []
+        self._metadatas: List[dict] = []
+        self._full = np.zeros((0, 0), dtype=np.float32)
+        self._codes = None
+        self._scales = None
+        self._masks = {}
+        if self.path and os.path.exists(os.path.join(self.path, "index.json")):
+            self._load()
+
+    def get_metadata(self) -> dict:
+        with self._lock:
+            return dict(self._metadata)
+
+    def set_metadata(self, metadata: dict):
+        with self._lock:
+            self._metadata = dict(metadata or {})
+            self._save(vectors_changed=False)
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[None, :]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _quantize(self, full: np.ndarray):
+        """Return (codes, scales) for the float32 rows; (None, None) when unquantized."""
+        if self.quantization == "float16":
+            return full.astype(np.float16), None
+        if self.quantization == "int8":
+            scales = (np.abs(full).max(axis=1) / 127.0).astype(np.float32)
+            scales[scales == 0] = 1.0
+            codes = np.round(full / scales[:, None]).astype(np.int8)
+            return codes, scales
+        return None, None
+
+    def _set_full(self, full: np.ndarray):
+        """Install new float32 rows: requantize, persist and reload."""
+        self._full = full
+        self._codes, self._scales = self._quantize(full)
+        self._masks.clear()
+        self._save()
+
+    def _save(self, vectors_changed: bool = True):
+        if not self.path:
+            return
+        os.makedirs(self.path, exist_ok=True)
+
+        def replace(name: str, write):
+            tmp_path = os.path.join(self.path, f".{name}.tmp")
+            write(tmp_path)
+            os.replace(tmp_path, os.path.join(self.path, name))
+
+        def save_array(array):
+            def write(tmp_path):
+                with open(tmp_path, "wb") as f:
+                    np.save(f, array)
+
+            return write
+
+        if vectors_changed:
+            replace("full.npy", save_array(np.asarray(self._full)))
+            if self._codes is not None:
+                replace("codes.npy", save_array(self._codes))
+            if self._scales is not None:
+                replace("scales.npy", save_array(self._scales))
+
+        def write_index(tmp_path):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "ids": self._ids,
+                        "texts": self._texts,
+                        "metadatas": self._metadatas,
+                        "metadata": self._metadata,
+                        "quantization": self.quantization,
+                    },
+                    f,
+                )
+
+        replace("index.json", write_index)
+        if vectors_changed and self._codes is not None:
+            # The quantized rows answer queries; float32 rows stay on disk
+            self._full = np.load(os.path.join(self.path, "full.npy"), mmap_mode="r")
+
+    def _load(self):
+        with open(os.path.join(self.path, "index.json"), encoding="utf-8") as f:
+            index = json.load(f)
+        self._ids = index["ids"]
+        self._texts = index["texts"]
+        self._metadatas = index["metadatas"]
+        self._metadata = index["metadata"]
+        self._rows = {chunk_id: row for row, chunk_id in enumerate(self._ids)}
+        full_path = os.path.join(self.path, "full.npy")
+        if self.quantization == "none":
+            self._full = np.load(full_path)
+            return
+        self._full = np.load(full_path, mmap_mode="r")
+        if index["quantization"] == self.quantization:
+            self._codes = np.load(os.path.join(self.path, "codes.npy"))
+            if self.quantization == "int8":
+                self._scales = np.load(os.path.join(self.path, "scales.npy"))
+        else:
+            # Stored with another setting; requantize from the float32 rows
+            self._set_full(np.asarray(self._full))
+
+    def upsert(
+        self,
+        ids: List[str],
+        vectors: List[List[float]],
+        texts: List[str],
+        metadatas: List[dict],
+    ):
+        if not ids:
+            return
+        new_rows = self._normalize(vectors)
+        with self._lock:
+            full = np.array(self._full, dtype=np.float32)
+            if full.shape[0] == 0:
+                full = np.zeros((0, new_rows.shape[1]), dtype=np.float32)
+            appended = []
+            for i, (chunk_id, text, metadata) in enumerate(zip(ids, texts, metadatas)):
+                row = self._rows.get(chunk_id)
+                if row is None:
+                    self._rows[chunk_id] = len(self._ids)
+                    appended.append(i)
+                    self._ids.append(chunk_id)
+                    self._texts.append(text)
+                    self._metadatas.append(dict(metadata or {}))
+                else:
+                    full[row] = new_rows[i]
+                    self._texts[row] = text
+                    self._metadatas[row] = dict(metadata or {})
+            if appended:
+                full = np.vstack([full, new_rows[appended]])
+            self._set_full(full)
+
+    def existing_ids(self, ids: List[str]) -> set:
+        with self._lock:
+            return {chunk_id for chunk_id in ids if chunk_id in self._rows}
+
+    def _mask(self, where: Optional[dict]) -> Optional[np.ndarray]:
+        """Boolean row mask for an equality filter; cached until the next write."""
+        if not where:
+            return None
+        key = tuple(sorted(where.items()))
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = np.array(
+                [
+                    all(metadata.get(k) == v for k, v in where.items())
+                    for metadata in self._metadatas
+                ],
+                dtype=bool,
+            )
+            self._masks[key] = mask
+        return mask
+
+    def delete(self, where: dict):
+        with self._lock:
+            mask = self._mask(where)
+            if mask is None or not mask.any():
+                return
+            keep = np.flatnonzero(~mask)
+            self._ids = [self._ids[i] for i in keep]
+            self._texts = [self._texts[i] for i in keep]
+            self._metadatas = [self._metadatas[i] for i in keep]
+            self._rows = {chunk_id: row for row, chunk_id in enumerate(self._ids)}
+            self._set_full(np.array(self._full[keep], dtype=np.float32))
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._ids)
+
+    def all_chunks(self):
+        """Return (ids, texts, metadatas) for every stored chunk."""
+        with self._lock:
+            return (
+                list(self._ids),
+                list(self._texts),
+                [dict(m) for m in self._metadatas],
+            )
+
+    def vectors(self) -> np.ndarray:
+        """Return the full-precision, L2-normalised rows (n x d)."""
+        with self._lock:
+            return np.array(self._full, dtype=np.float32)
+
+    def memory_bytes(self) -> int:
+        """Bytes of vector data held in RAM (memory-mapped rows not counted)."""
+        with self._lock:
+            arrays = [self._codes, self._scales]
+            if not isinstance(self._full, np.memmap):
+                arrays.append(self._full)
+            return sum(array.nbytes for array in arrays if array is not None)
+
+    def _approximate_scores(self, query: np.ndarray) -> np.ndarray:
+        if self._codes is None:
+            return self._full @ query
+        # Dequantize in blocks so the float32 temporary stays cache-sized
+        scores = np.empty(len(self._codes), dtype=np.float32)
+        for start in range(0, len(self._codes), self.SCORE_BLOCK_ROWS):
+            block = self._codes[start : start + self.SCORE_BLOCK_ROWS]
+            scores[start : start + len(block)] = block.astype(np.float32) @ query
+        if self._scales is not None:
+            scores *= self._scales
+        return scores
+
+    def search(
+        self, query_vector: List[float], k: int, where: Optional[dict] = None
+    ) -> List[Document]:
+        with self._lock:
+            if not self._ids or k <= 0:
+                return []
+            query = self._normalize(query_vector)[0]
+            scores = self._approximate_scores(query)
+            mask = self._mask(where)
+            if mask is not None:
+                scores = np.where(mask, scores, -np.inf)
+                available = int(mask.sum())
+            else:
+                available = len(self._ids)
+            k = min(k, available)
+            if k == 0:
+                return []
+            if self._codes is not None:
+                # Shortlist on the quantized scores, then rank exactly
+                shortlist = min(available, k * self.rescore_factor)
+                rows = np.sort(np.argpartition(-scores, shortlist - 1)[:shortlist])
+                exact = np.asarray(self._full[rows]) @ query
+                top = rows[np.argsort(-exact)[:k]]
+            else:
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top])]
+            return [
+                Document(page_content=self._texts[i], metadata=dict(self._metadatas[i]))
+                for i in top
+            ]
+
+    def delete_collection(self):
+        with self._lock:
+            self._ids, self._texts, self._metadatas = [], [], []
+            self._rows = {}
+            self._full = np.zeros((0, 0), dtype=np.float32)
+            self._codes = self._scales = None
+            self._metadata = {}
+            self._masks.clear()
+            if self.path and os.path.isdir(self.path):
+                shutil.rmtree(self.path, ignore_errors=True)
+
+
+def stored_collections(
+    backend_name: str, chroma_client_factory=None, persist_dir: Optional[str] = None
+) -> Dict[str, dict]:
+    """{collection name: collection metadata} for every persisted collection."""
+    if backend_name == "numpy":
+        if not persist_dir or not os.path.isdir(persist_dir):
+            return {}
+        collections = {}
+        for name in os.listdir(persist_dir):
+            index_path = os.path.join(persist_dir, name, "index.json")
+            if os.path.exists(index_path):
+                with open(index_path, encoding="utf-8") as f:
+                    collections[name] = json.load(f).get("metadata", {})
+        return collections
+    client = chroma_client_factory()
+    collections = {}
+    for collection in client.list_collections():
+        # Newer Chroma releases list names rather than collection objects
+        if isinstance(collection, str):
+            collection = client.get_collection(collection)
+        collections[collection.name] = dict(collection.metadata or {})
+    return collections
+
+
+def delete_stored_collection(
+    backend_name: str,
+    collection_name: str,
+    chroma_client_factory=None,
+    persist_dir: Optional[str] = None,
+):
+    """Delete a persisted collection without loading it."""
+    if backend_name == "numpy":
+        if persist_dir:
+            shutil.rmtree(
+                os.path.join(persist_dir, collection_name), ignore_errors=True
+            )
+        return
+    chroma_client_factory().delete_collection(collection_name)
+
+
+def create_backend(
+    backend_name: str,
+    collection_name: str,
+    chroma_client_factory=None,
+    persist_dir: Optional[str] = None,
+    quantization: str = "none",
+):
+    """Build the configured vector backend ("chroma" or "numpy").
+
+    ``persist_dir`` and ``quantization`` only apply to the NumPy backend.
+    """
+    if backend_name == "numpy":
+        return NumpyBackend(collection_name, persist_dir, quantization)
+    if backend_name != "chroma":
+        logging.warning(f"Unknown vector backend {backend_name!r}; using Chroma")
+    return ChromaBackend(collection_name, chroma_client_factory())